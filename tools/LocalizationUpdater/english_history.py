@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+
+def _encode_value(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+class EnglishHistory:
+    """
+    Every version of the English source files seen by the updater.
+
+    A version is one flat {key: value} state of a source file. Values are
+    stored once per distinct text, as zlib-compressed blobs addressed by
+    their hash. Each key has a list of ranges: the value it held from one
+    version up to another, open-ended while it is unchanged. Adding a
+    version therefore only writes the keys that changed, and the value of
+    a key in any version is a single indexed lookup. The key order of each
+    version is kept as one compressed list, so a version can be rebuilt in
+    its original order.
+
+    It also records, per Polish file, the English version it was last
+    updated against, so the next run can diff against that version even if
+    a run was interrupted or releases were skipped.
+    """
+
+    def __init__(self, db_path: Optional[str]):
+        self.db_path = db_path
+        self._connection = None
+
+        if db_path is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(db_path, timeout=30)
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS versions ("
+                " id INTEGER PRIMARY KEY,"
+                " source TEXT NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " added REAL NOT NULL,"
+                " keys BLOB NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS versions_source ON versions (source, id);"
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " hash TEXT NOT NULL PRIMARY KEY,"
+                " compressed INTEGER NOT NULL,"
+                " data BLOB NOT NULL) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS key_ranges ("
+                " source TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " first_version INTEGER NOT NULL,"
+                " last_version INTEGER,"
+                " hash TEXT NOT NULL,"
+                " PRIMARY KEY (source, key, first_version)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS translation_bases ("
+                " pl_path TEXT NOT NULL PRIMARY KEY,"
+                " source TEXT NOT NULL,"
+                " version INTEGER NOT NULL);"
+            )
+        except sqlite3.Error as e:
+            logging.error(f"English history at {db_path} is unavailable: {str(e)}")
+            self._connection = None
+
+    def latest_version(self, source: str) -> Optional[int]:
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT id FROM versions WHERE source = ? ORDER BY id DESC LIMIT 1", (source,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def versions(self, source: str) -> List[Tuple[int, float]]:
+        """(version, time added) of every version of 'source', oldest first."""
+        if self._connection is None:
+            return []
+        return self._connection.execute(
+            "SELECT id, added FROM versions WHERE source = ? ORDER BY id", (source,)
+        ).fetchall()
+
+    def add_version(self, source: str, flat: Dict[str, object]) -> Optional[int]:
+        """
+        Records 'flat' as the newest version of 'source' and returns its
+        version. Content equal to the newest version is not stored again.
+        """
+        if self._connection is None:
+            return None
+
+        encoded = {key: _encode_value(value) for key, value in flat.items()}
+        hashes = {key: hashlib.sha1(data).hexdigest() for key, data in encoded.items()}
+        digest = hashlib.sha256(json.dumps(list(hashes.items()), ensure_ascii=False).encode('utf-8')).hexdigest()
+
+        try:
+            with self._connection:
+                latest = self._connection.execute(
+                    "SELECT id, digest FROM versions WHERE source = ? ORDER BY id DESC LIMIT 1", (source,)
+                ).fetchone()
+                if latest is not None and latest[1] == digest:
+                    return latest[0]
+
+                keys = zlib.compress(json.dumps(list(flat), ensure_ascii=False).encode('utf-8'))
+                version = self._connection.execute(
+                    "INSERT INTO versions (source, digest, added, keys) VALUES (?, ?, ?, ?)",
+                    (source, digest, time.time(), keys)
+                ).lastrowid
+
+                # Ranges still open at the previous version; only keys whose value differs are touched
+                current = dict(self._connection.execute(
+                    "SELECT key, hash FROM key_ranges WHERE source = ? AND last_version IS NULL", (source,)
+                ))
+                changed = []
+                ended = []
+                for key, value_hash in hashes.items():
+                    previous_hash = current.pop(key, None)
+                    if previous_hash != value_hash:
+                        changed.append(key)
+                        if previous_hash is not None:
+                            ended.append(key)
+                # Keys left over were removed in this version
+                ended.extend(current)
+
+                self._connection.executemany(
+                    "UPDATE key_ranges SET last_version = ? WHERE source = ? AND key = ? AND last_version IS NULL",
+                    ((latest[0] if latest else None, source, key) for key in ended)
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO blobs (hash, compressed, data) VALUES (?, ?, ?)",
+                    (self._blob_row(hashes[key], encoded[key]) for key in changed)
+                )
+                self._connection.executemany(
+                    "INSERT INTO key_ranges (source, key, first_version, last_version, hash) VALUES (?, ?, ?, NULL, ?)",
+                    ((source, key, version, hashes[key]) for key in changed)
+                )
+            return version
+        except sqlite3.Error as e:
+            logging.error(f"Failed to record English version in {self.db_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _blob_row(value_hash: str, data: bytes):
+        # Short strings grow when compressed, so they are kept as they are
+        compressed = zlib.compress(data)
+        if len(compressed) < len(data):
+            return value_hash, 1, compressed
+        return value_hash, 0, data
+
+    @staticmethod
+    def _decode_blob(compressed: int, data: bytes):
+        return json.loads(zlib.decompress(data) if compressed else data)
+
+    def get_value(self, source: str, key: str, version: int, default=None):
+        """The value 'key' had in 'version' of 'source', or 'default' if it didn't exist."""
+        if self._connection is None:
+            return default
+        row = self._connection.execute(
+            "SELECT r.last_version, b.compressed, b.data FROM key_ranges r JOIN blobs b ON b.hash = r.hash"
+            " WHERE r.source = ? AND r.key = ? AND r.first_version <= ?"
+            " ORDER BY r.first_version DESC LIMIT 1",
+            (source, key, version)
+        ).fetchone()
+        if row is None or row[0] is not None and row[0] < version:
+            return default
+        return self._decode_blob(row[1], row[2])
+
+    def get_version(self, source: str, version: int, shared_keys: Optional[Dict[str, str]] = None) -> Optional[Dict[str, object]]:
+        """Rebuilds 'version' of 'source' as a flat dict in its original key order, or None if unknown."""
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT keys FROM versions WHERE source = ? AND id = ?", (source, version)
+        ).fetchone()
+        if row is None:
+            return None
+
+        values = {
+            key: self._decode_blob(compressed, data)
+            for key, compressed, data in self._connection.execute(
+                "SELECT r.key, b.compressed, b.data FROM key_ranges r JOIN blobs b ON b.hash = r.hash"
+                " WHERE r.source = ? AND r.first_version <= ? AND (r.last_version IS NULL OR r.last_version >= ?)",
+                (source, version, version)
+            )
+        }
+        share_key = shared_keys.setdefault if shared_keys is not None else (lambda key, default: key)
+        return {share_key(key, key): values[key] for key in json.loads(zlib.decompress(row[0]))}
+
+    def get_translation_base(self, pl_path: str, source: str) -> Optional[int]:
+        """The version of 'source' the Polish file was last updated against."""
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT version FROM translation_bases WHERE pl_path = ? AND source = ?", (pl_path, source)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_translation_base(self, pl_path: str, source: str, version: int):
+        if self._connection is None:
+            return
+        try:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO translation_bases (pl_path, source, version) VALUES (?, ?, ?)",
+                    (pl_path, source, version)
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update English history at {self.db_path}: {str(e)}")
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,162 @@
+import regex
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Flat key encoding used by LocalizationUpdater:
+#   - nested dict keys are joined with '.', e.g. "SETTINGS.Title"
+#   - a key starting with '.', or starting with ' ' under a path ending in '.',
+#     is appended without an extra separator
+#   - list items are appended as "{index}", e.g. "Tips{0}"
+# When rebuilding, a '.' only separates keys if it is not followed by
+# whitespace or another '.', and "name{index}" segments address list items.
+
+_WHITESPACE_PATTERN = regex.compile(r'\s')
+
+
+@lru_cache(maxsize=None)
+def _is_whitespace(char: str) -> bool:
+    return _WHITESPACE_PATTERN.match(char) is not None
+
+
+def child_flat_key(path: str, key: str) -> str:
+    """Flat key of the dict entry 'key' under the flat key 'path' (inlined in flatten_localization)."""
+    if not path:
+        return key
+    if path[-1] == "." and key[:1] == " " or key[:1] == ".":
+        return path + key
+    return f"{path}.{key}"
+
+
+def flatten_localization(obj, shared_keys: Optional[Dict[str, str]] = None) -> Optional[Dict[str, object]]:
+    """
+    Flattens nested localization JSON into a {flat_key: value} dict.
+
+    Walks the tree with an explicit stack, so each node's path is built once
+    and no recursion is needed. Leaves of a container are handled in a tight
+    loop; the stack is only touched when descending into a child container.
+
+    If 'shared_keys' is given, every flat key is looked up in it first, so
+    dicts flattened with the same table hold one string object per key
+    instead of one copy each.
+    """
+    if obj is None:
+        return None
+
+    result = {}
+    if not isinstance(obj, (dict, list)):
+        result[''] = obj
+        return result
+
+    share_key = shared_keys.setdefault if shared_keys is not None else None
+    stack = [(iter(obj.items()) if isinstance(obj, dict) else iter(enumerate(obj)), '', isinstance(obj, list))]
+
+    while stack:
+        iterator, path, is_list = stack.pop()
+        for key, value in iterator:
+            if is_list:
+                new_path = f"{path}{{{key}}}"
+            elif path:
+                if path[-1] == "." and key[:1] == " " or key[:1] == ".":
+                    new_path = path + key
+                else:
+                    new_path = f"{path}.{key}"
+            else:
+                new_path = key
+
+            if isinstance(value, dict):
+                child = (iter(value.items()), new_path, False)
+            elif isinstance(value, list):
+                child = (iter(enumerate(value)), new_path, True)
+            else:
+                if share_key is not None:
+                    new_path = share_key(new_path, new_path)
+                result[new_path] = value
+                continue
+
+            # Resume this container after the child is done, keeping document order
+            stack.append((iterator, path, is_list))
+            stack.append(child)
+            break
+
+    return result
+
+
+def split_flat_key(compound_key: str) -> List[str]:
+    """Splits a flat key into its path segments, dropping empty ones."""
+    parts = compound_key.split('.')
+    segments = []
+    current = parts[0]
+    last_index = len(parts) - 1
+
+    for index in range(1, len(parts)):
+        part = parts[index]
+        # The '.' before 'part' is kept when followed by whitespace or another '.'
+        if part and _is_whitespace(part[0]) or not part and index != last_index:
+            current = f"{current}.{part}"
+        else:
+            if current:
+                segments.append(current)
+            current = part
+
+    if current:
+        segments.append(current)
+    return segments
+
+
+def rebuild_nested(flat_dict: Dict[str, object]) -> dict:
+    """Rebuilds nested localization JSON from a {flat_key: value} dict."""
+    nested_json = {}
+    parent_cache = {}
+
+    for compound_key, value in flat_dict.items():
+        keys = split_flat_key(compound_key)
+        if not keys:
+            continue
+
+        # Consecutive keys usually share their parent, so reuse its container
+        parent_path = tuple(keys[:-1])
+        current_level = parent_cache.get(parent_path)
+        if current_level is None:
+            current_level = nested_json
+            for key in keys[:-1]:
+                current_level = _descend(current_level, key)
+            parent_cache[parent_path] = current_level
+
+        if _assign(current_level, keys[-1], value):
+            # A container was replaced, so cached parents inside it are stale; later keys
+            # under it descend from the root again and fail on the value like before
+            parent_cache.clear()
+
+    return nested_json
+
+
+def _descend(current_level: dict, key: str):
+    if '{' in key and '}' in key:
+        list_name, list_index = key.replace('}', '').split('{')
+        list_index = int(list_index)
+        items = current_level.setdefault(list_name, [])
+        while len(items) <= list_index:
+            items.append(None)
+        if items[list_index] is None:
+            items[list_index] = {}
+        return items[list_index]
+
+    if key not in current_level:
+        current_level[key] = {}
+    return current_level[key]
+
+
+def _assign(current_level: dict, key: str, value) -> bool:
+    """Sets 'key' to 'value'. Returns True if this replaced a container."""
+    if '{' in key and '}' in key:
+        list_name, list_index = key.replace('}', '').split('{')
+        list_index = int(list_index)
+        items = current_level.setdefault(list_name, [])
+        while len(items) <= list_index:
+            items.append(None)
+        previous = items[list_index]
+        items[list_index] = value
+    else:
+        previous = current_level[key] if key in current_level else None
+        current_level[key] = value
+    return isinstance(previous, (dict, list))
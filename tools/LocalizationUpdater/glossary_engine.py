@@ -0,0 +1,136 @@
+import time
+import regex
+from typing import Dict, List, Tuple, Union
+
+# Characters that make a pattern body something other than a plain literal
+REGEX_METACHARACTERS = set('.^$*+?{}[]|()\\')
+
+
+def _literal_body(pattern: str) -> Union[str, None]:
+    """
+    Returns the literal text of a '\\bWord\\b' style glossary pattern,
+    or None if the pattern uses any other regex syntax.
+    """
+    if not (pattern.startswith(r'\b') and pattern.endswith(r'\b')):
+        return None
+
+    body = pattern[2:-2]
+    if not body or any(char in REGEX_METACHARACTERS for char in body):
+        return None
+    return body
+
+
+def _is_literal_replacement(replacement: str) -> bool:
+    """Replacements with backslashes may hold group references or escapes."""
+    return '\\' not in replacement
+
+
+class _TrieNode:
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.terminal = False
+
+
+class GlossaryTrie:
+    """
+    Character trie over glossary terms, emitted as a single regex alternation.
+
+    Shared prefixes are factored out, so the regex engine walks the trie
+    instead of trying every term at every position. Longer terms are tried
+    before their prefixes, so the longest glossary term always wins.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def add(self, word: str):
+        node = self.root
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+        node.terminal = True
+
+    def _node_pattern(self, node: _TrieNode) -> str:
+        branches = [
+            regex.escape(char) + self._node_pattern(child)
+            for char, child in sorted(node.children.items())
+        ]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not node.terminal:
+            return branches[0]
+
+        grouped = '(?:{})'.format('|'.join(branches))
+        # An optional group is greedy, so the longer continuation is tried first
+        return f'{grouped}?' if node.terminal else grouped
+
+    def to_pattern(self) -> str:
+        return self._node_pattern(self.root)
+
+
+class GlossaryEngine:
+    """
+    Applies an ordered list of (pattern, replacement) rules to text.
+
+    Consecutive '\\bWord\\b' literal rules are folded into one trie-based
+    regex and applied in a single left-to-right pass. Any other rule (e.g.
+    the formatting rewrites) still runs as its own regex, in its original
+    position within the rule list.
+
+    Within a folded group, overlapping terms resolve to the leftmost match
+    and then to the longest term, so "Core Settings" wins over "Settings".
+    If the same term is listed twice, the first replacement is kept.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, str]]):
+        self.patterns = list(patterns)
+        self.steps = []
+        # (label, literal table or None) for each step, used by apply_profiled()
+        self.step_info = []
+
+        literal_group: Dict[str, str] = {}
+        for pattern, replacement in self.patterns:
+            body = _literal_body(pattern)
+            if body is not None and _is_literal_replacement(replacement):
+                literal_group.setdefault(body, replacement)
+                continue
+
+            self._flush_literal_group(literal_group)
+            literal_group = {}
+            self.steps.append((regex.compile(pattern), replacement))
+            self.step_info.append((pattern, None))
+
+        self._flush_literal_group(literal_group)
+
+    def _flush_literal_group(self, literal_group: Dict[str, str]):
+        if not literal_group:
+            return
+
+        trie = GlossaryTrie()
+        for word in literal_group:
+            trie.add(word)
+
+        compiled = regex.compile(rf'\b(?:{trie.to_pattern()})\b')
+        self.steps.append((compiled, lambda match, table=literal_group: table[match.group(0)]))
+        self.step_info.append((f"glossary[{len(literal_group)} terms]", literal_group))
+
+    def apply(self, text: str) -> str:
+        """Runs all rules over 'text' and returns the translated result."""
+        for pattern, replacement in self.steps:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def apply_profiled(self, text: str, profiler) -> str:
+        """Same as apply(), but records per-step time and hits, and per-term hits, in 'profiler'."""
+        for (pattern, replacement), (label, table) in zip(self.steps, self.step_info):
+            if table is not None:
+                def replacement(match, table=table):
+                    term = match.group(0)
+                    profiler.count_term(rf'\b{term}\b')
+                    return table[term]
+
+            start = time.perf_counter()
+            text, hits = pattern.subn(replacement, text)
+            profiler.record_pattern(label, hits, time.perf_counter() - start)
+        return text
@@ -0,0 +1,54 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+
+class UpdaterProfiler:
+    """Per-stage timers, per-pattern hit/time stats and event counters for one LocalizationUpdater run."""
+
+    def __init__(self):
+        self.stage_seconds = {}
+        self.counters = Counter()
+        self.pattern_stats = {}
+        self.term_hits = Counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def record_pattern(self, label: str, hits: int, seconds: float):
+        stats = self.pattern_stats.get(label)
+        if stats is None:
+            stats = self.pattern_stats[label] = {"calls": 0, "hits": 0, "seconds": 0.0}
+        stats["calls"] += 1
+        stats["hits"] += hits
+        stats["seconds"] += seconds
+
+    def count_term(self, pattern: str):
+        self.term_hits[pattern] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": self.stage_seconds,
+            "counters": dict(self.counters),
+            "patterns": self.pattern_stats,
+            "glossary_term_hits": dict(self.term_hits.most_common()),
+        }
+
+
+def profiler_stage(profiler, name: str):
+    """Returns the profiler's stage timer, or a no-op context when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def write_profile_report(path: str, reports: dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"files": reports}, f, indent=4, ensure_ascii=False)
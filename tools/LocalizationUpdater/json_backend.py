@@ -0,0 +1,98 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# 'auto' picks the fastest installed backend. Every backend produces the
+# same output as json.dumps(indent=..., ensure_ascii=False); data a faster
+# backend would format differently (floats) is serialized with the stdlib.
+JSON_BACKENDS = ('auto', 'stdlib', 'orjson', 'ujson')
+
+
+def is_json_backend_available(backend: str) -> bool:
+    if backend == 'orjson':
+        return orjson is not None
+    if backend == 'ujson':
+        return ujson is not None
+    return backend in ('auto', 'stdlib')
+
+
+def resolve_json_backend(backend: str) -> str:
+    """
+    Returns the concrete backend used for 'backend', falling back to the stdlib.
+    'auto' prefers ujson, which indents natively and reads numbers like the
+    stdlib (orjson output is reindented from 2 spaces, and orjson reads
+    integers beyond 64 bits as floats).
+    """
+    if backend == 'auto':
+        return next((name for name in ('ujson', 'orjson') if is_json_backend_available(name)), 'stdlib')
+    return backend if is_json_backend_available(backend) else 'stdlib'
+
+
+def loads_json(content, backend: str = 'auto'):
+    """Parses JSON text (str or UTF-8 bytes), keeping key order. Errors are those of the stdlib parser."""
+    backend = resolve_json_backend(backend)
+    try:
+        if backend == 'orjson':
+            return orjson.loads(content)
+        if backend == 'ujson':
+            return ujson.loads(content)
+    except (ValueError, OverflowError):
+        # Let the stdlib parse what the fast parser rejects (e.g. NaN, huge integers) or report the error
+        pass
+    return json.loads(content.decode('utf-8') if isinstance(content, bytes) else content)
+
+
+def load_json(filepath: str, backend: str = 'auto'):
+    """Parses a UTF-8 JSON file; see loads_json."""
+    with open(filepath, 'rb') as f:
+        return loads_json(f.read(), backend)
+
+
+def _contains_float(data) -> bool:
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        for value in (node.values() if isinstance(node, dict) else node):
+            if isinstance(value, float):
+                return True
+            if isinstance(value, (dict, list, tuple)):
+                stack.append(value)
+    return False
+
+
+def _reindent(text: str, indent: int) -> str:
+    """
+    Converts 2-space indented JSON to 'indent' spaces per level. JSON strings
+    cannot hold raw newlines, so leading spaces are always indentation.
+    """
+    if indent == 2:
+        return text
+    lines = text.split('\n')
+    if indent == 4:
+        return '\n'.join([line[:len(line) - len(line.lstrip(' '))] + line for line in lines])
+    return '\n'.join([' ' * ((len(line) - len(stripped)) // 2 * indent) + stripped
+                      for line, stripped in ((line, line.lstrip(' ')) for line in lines)])
+
+
+def dumps_json(data, indent: int = 4, backend: str = 'auto') -> str:
+    """Same result as json.dumps(data, indent=indent, ensure_ascii=False)."""
+    backend = resolve_json_backend(backend)
+    if backend != 'stdlib' and isinstance(data, (dict, list, tuple)) and not _contains_float(data):
+        try:
+            if backend == 'ujson':
+                # ujson treats indent=0 as compact output, json as newlines without indentation
+                if indent:
+                    return ujson.dumps(data, indent=indent, ensure_ascii=False, escape_forward_slashes=False)
+                return _reindent(ujson.dumps(data, indent=2, ensure_ascii=False, escape_forward_slashes=False), 0)
+            return _reindent(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'), indent)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False)
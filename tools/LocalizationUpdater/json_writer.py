@@ -0,0 +1,41 @@
+import os
+import shutil
+import hashlib
+
+from update_manifest import file_hash
+from json_backend import dumps_json
+
+
+def serialize_json(data, backend: str = 'auto') -> bytes:
+    """
+    Serializes 'data' exactly as json.dump(indent=4, ensure_ascii=False)
+    through a text-mode file would, including platform line endings.
+    """
+    text = dumps_json(data, 4, backend)
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode('utf-8')
+
+
+def write_if_changed(filepath: str, content: bytes) -> bool:
+    """
+    Writes 'content' to 'filepath' unless the file already holds exactly these
+    bytes, so unchanged files keep their modification time. The new content is
+    written to a temporary file next to the target and renamed over it, so the
+    target is never left half written. Returns True if the file was written.
+    """
+    if file_hash(filepath) == hashlib.sha256(content).hexdigest():
+        return False
+
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    temp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_path)
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
@@ -0,0 +1,74 @@
+import os
+import shutil
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 'auto' tries a copy-on-write clone, then a hardlink, then a full copy
+SNAPSHOT_MODES = ('auto', 'reflink', 'hardlink', 'copy')
+
+_METHODS = {
+    'auto': ('reflink', 'hardlink', 'copy'),
+    'reflink': ('reflink', 'copy'),
+    'hardlink': ('hardlink', 'copy'),
+    'copy': ('copy',),
+}
+
+# Linux ioctl making a file share the data blocks of another (Btrfs, XFS, bcachefs, ...)
+_FICLONE = 0x40049409
+
+
+def _reflink(src_path: str, dst_path: str):
+    with open(src_path, 'rb') as source, open(dst_path, 'wb') as target:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    shutil.copystat(src_path, dst_path)
+
+
+def _snapshot_file(src_path: str, dst_path: str, methods: list) -> str:
+    """Snapshots one file with the first method that works and returns its name."""
+    while True:
+        method = methods[0]
+        try:
+            if method == 'reflink':
+                _reflink(src_path, dst_path)
+            elif method == 'hardlink':
+                os.link(src_path, dst_path)
+            else:
+                shutil.copy2(src_path, dst_path)
+            return method
+        except OSError:
+            if method == 'copy':
+                raise
+            if os.path.lexists(dst_path):
+                os.remove(dst_path)
+            # The whole tree is usually on one filesystem, so don't retry this method for other files
+            methods.pop(0)
+
+
+def snapshot_directory(src_directory: str, dst_directory: str, mode: str = 'auto') -> Dict[str, int]:
+    """
+    Replaces 'dst_directory' with a snapshot of the files in 'src_directory'.
+
+    Files are cloned copy-on-write where the filesystem supports it, else
+    hardlinked, else copied, so a snapshot costs file metadata instead of a
+    full copy of the data. A hardlinked snapshot shares the file with the
+    source; it stays unchanged only because every writer of the source tree
+    replaces files (write_if_changed) instead of rewriting them in place.
+
+    Returns the number of files snapshotted with each method.
+    """
+    if os.path.exists(dst_directory):
+        shutil.rmtree(dst_directory)
+    os.makedirs(dst_directory)
+
+    methods = [method for method in _METHODS[mode] if method != 'reflink' or fcntl is not None]
+    counts = {'reflink': 0, 'hardlink': 0, 'copy': 0}
+    for root, _, files in os.walk(src_directory):
+        target_root = os.path.join(dst_directory, os.path.relpath(root, src_directory))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            counts[_snapshot_file(os.path.join(root, name), os.path.join(target_root, name), methods)] += 1
+    return counts
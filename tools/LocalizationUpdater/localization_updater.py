@@ -1,5 +1,4 @@
 import os
-import json
 import logging
 import regex
 from collections import Counter
@@ -9,6 +8,18 @@ from difflib import SequenceMatcher
 from typing import Dict, List, Set, Tuple, Optional
 
 from auto_translation_regex import PATTERN_MAPPING
+from glossary_engine import GlossaryEngine
+from pretranslation_cache import PretranslationCache, patterns_fingerprint
+from similarity import similarity_at_least, is_backend_available
+from flat_keys import flatten_localization, rebuild_nested
+from instrumentation import UpdaterProfiler, profiler_stage
+from update_manifest import file_hash, subtree_hashes
+from rename_matcher import find_fuzzy_renames
+from translation_memory import TranslationMemory
+from english_history import EnglishHistory
+from json_writer import serialize_json, write_if_changed
+from json_backend import load_json, is_json_backend_available
+from streaming_json import load_flat_json
 
 class LocalizationUpdater:
     # Reference symbols detection regex patterns
@@ -21,7 +32,24 @@ class LocalizationUpdater:
         r'\\n'
     ]
 
-    def __init__(self, en_old_path: str, en_path: str, pl_path: str, verbose: bool, log_identifier: str, is_new_file: bool = False, logger=None):
+    RUDIMENTARY_SIMILARITY_THRESHOLD = 0.75
+
+    # A removed and an added key are treated as a rename if their values are this similar
+    FUZZY_RENAME_THRESHOLD = 0.8
+    # Shorter values are too generic to tell a rename from an unrelated new key
+    FUZZY_RENAME_MIN_LENGTH = 12
+
+    # New keys reuse an existing translation of an English text at least this similar
+    TRANSLATION_MEMORY_THRESHOLD = 0.9
+
+    # Chunked parallel pretranslation is only worth its start-up cost on large files
+    PARALLEL_CHUNK_SIZE = 500
+    PARALLEL_MIN_ITEMS = 2000
+
+    # Files at least this large are flattened while parsing, without building the nested tree
+    STREAMING_LOAD_MIN_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, en_old_path: str, en_path: str, pl_path: str, verbose: bool, log_identifier: str, is_new_file: bool = False, logger=None, cache_path: Optional[str] = None, similarity_backend: str = 'difflib', pretranslation_workers: int = 1, profile: bool = False, previous_state: Optional[dict] = None, translation_memory_path: Optional[str] = None, use_translation_memory: bool = True, json_backend: str = 'auto', english_history_path: Optional[str] = None):
         self.en_old_path = en_old_path
         self.en_path = en_path
         self.pl_path = pl_path
@@ -29,21 +57,58 @@ class LocalizationUpdater:
         self.log_identifier = log_identifier
         self.is_new_file = is_new_file
         self.logger = logger
+        self.cache_path = cache_path
+        self.translation_memory_path = translation_memory_path
+        self.use_translation_memory = use_translation_memory
+        # History of English versions (None = disabled), and the version of en_path recorded in it
+        self.english_history_path = english_history_path
+        self.en_version = None
+
+        if not is_backend_available(similarity_backend):
+            logging.warning(f"Similarity backend '{similarity_backend}' is not available, falling back to 'difflib'.")
+            similarity_backend = 'difflib'
+        self.similarity_backend = similarity_backend
+
+        if not is_json_backend_available(json_backend):
+            logging.warning(f"JSON backend '{json_backend}' is not available, falling back to 'stdlib'.")
+            json_backend = 'stdlib'
+        self.json_backend = json_backend
+        self.pretranslation_workers = pretranslation_workers
+        self.profiler = UpdaterProfiler() if profile else None
+
+        # Incremental mode: manifest entry written by the previous run (None = disabled)
+        self.previous_state = previous_state
+        # Keys visited by _process_translations, None = all of en_extracted
+        self.keys_to_visit = None
+        # Hashes of the files as saved by this run, for the next run's manifest
+        self.saved_state = None
         
         self.en_old_extracted = {}
         self.en_extracted = {}
         self.pl_extracted = {}
+        # Flat key -> the one string object used for it by all three dicts above
+        self.shared_keys = {}
 
         self.new_keys = []
         self.removed_keys = []
         self.renamed_keys = []
+        self.fuzzy_renamed_keys = []
         self.outdated_keys = []
         self.updated_eng_keys = []
         self.rudimentary_translations_updated = []
         self.review_needed_keys = []
+        # (key, matched English text, similarity, Polish file of the match) for new keys translated from the translation memory
+        self.memory_translated_keys = []
+
+        # Placeholder for the glossary engine, will be compiled in process()
+        self.selected_patterns = []
+        self.glossary_engine = GlossaryEngine([])
+        self.pretranslation_cache = None
+        self.translation_memory = None
 
-        # Placeholder for patterns, will be compiled in process()
-        self.compiled_replacement_patterns = []
+        # Results computed ahead of the main loop by worker processes
+        self.precomputed_pretranslations = {}
+        self.precomputed_rudimentary = {}
 
         self.compiled_patterns = [regex.compile(pattern) for pattern in self.RUDIMENTARY_TRANSLATION_REGEX_PATTERNS]
 
@@ -73,10 +138,11 @@ class LocalizationUpdater:
                 selected_patterns = patterns
                 break
 
-        self.compiled_replacement_patterns = [
-            (regex.compile(pattern), replacement)
-            for pattern, replacement in selected_patterns
-        ]
+        self.selected_patterns = selected_patterns
+        self.glossary_engine = GlossaryEngine(selected_patterns)
+
+        if self.cache_path:
+            self.pretranslation_cache = PretranslationCache(self.cache_path, patterns_fingerprint(selected_patterns))
 
 
     def _log_and_print(self, message, level='info', color=''):
@@ -94,92 +160,54 @@ class LocalizationUpdater:
 
     def _get_file_from_directory(self, filepath):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with profiler_stage(self.profiler, 'load_json'):
+                return load_json(filepath, self.json_backend)
         except Exception as e:
             logging.error(f"An error occurred while loading the JSON file: {filepath}: {str(e)}")
             return None
 
     def _save_file_to_directory(self, filepath, data):
+        with profiler_stage(self.profiler, 'save_json'):
+            content = serialize_json(data, self.json_backend)
+        self._save_serialized_file(filepath, content)
+
+    def _save_serialized_file(self, filepath, content: bytes):
+        """Atomically replaces the file with 'content', skipping the write if nothing changed."""
         try:
-            # Ensure the directory of the file exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # Save the data to the specified filepath
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            with profiler_stage(self.profiler, 'save_json'):
+                written = write_if_changed(filepath, content)
+            if self.profiler:
+                self.profiler.count('files_written' if written else 'files_unchanged')
         except Exception as e:
             logging.error(f"An error occurred while saving the JSON file to {filepath}: {str(e)}")
 
-    def _extract_localization_dict(self, obj, current_path='', result_dict=None):
-        if obj is None:
+    def _load_flat_file(self, filepath):
+        """
+        Loads 'filepath' as a {flat_key: value} dict. Large files are read with
+        the streaming parser, so their nested tree is never held in memory.
+        """
+        if not os.path.exists(filepath) or os.path.getsize(filepath) < self.STREAMING_LOAD_MIN_BYTES:
+            return self._extract_localization_dict(self._get_file_from_directory(filepath))
+        try:
+            with profiler_stage(self.profiler, 'load_json_streaming'):
+                return load_flat_json(filepath, self.shared_keys)
+        except Exception as e:
+            logging.error(f"An error occurred while loading the JSON file: {filepath}: {str(e)}")
             return None
-        
-        if result_dict is None:
-            result_dict = {}
-        
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if current_path:
-                    # if current path ends with
-                    if current_path[-1] == "." and key[0]==" " or key[0]==".":
-                        new_path = f'{current_path}{key}'
-                    else:
-                        new_path = f'{current_path}.{key}'
-                else:
-                    new_path = key
-
-                self._extract_localization_dict(value, new_path, result_dict)
-
-        elif isinstance(obj, list):
-            for index, item in enumerate(obj):
-                new_path = f"{current_path}{{{index}}}"
-                self._extract_localization_dict(item, new_path, result_dict)
-        else:
-            result_dict[current_path] = obj
 
-        return result_dict
+    def _extract_localization_dict(self, obj):
+        with profiler_stage(self.profiler, 'flatten'):
+            return flatten_localization(obj, self.shared_keys)
 
     def _rebuild_nested_json(self, flat_dict):
-        nested_json = {}
-
-        for compound_key, value in flat_dict.items():
-            # Split the key intelligently based on '.' not followed by whitespace
-            keys = [k for k in regex.split(r'\.(?![\s.])', compound_key) if k]
-            current_level = nested_json
-
-            for i, key in enumerate(keys):
-                if '{' in key and '}' in key:
-                    # Split the key on the brackets to get the list name and index
-                    list_name, list_index = key.replace('}', '').split('{')
-                    list_index = int(list_index)
-                    
-                    # Ensure the list exists and has enough space for the index
-                    if list_name not in current_level:
-                        current_level[list_name] = []
-                    while len(current_level[list_name]) <= list_index:
-                        current_level[list_name].append(None)
-                    
-                    # If it's the last key, set the value
-                    if i == len(keys) - 1:
-                        current_level[list_name][list_index] = value
-                    else:
-                        # Prepare for the next level of nesting
-                        if current_level[list_name][list_index] is None:
-                            current_level[list_name][list_index] = {}
-                        current_level = current_level[list_name][list_index]
-                else:
-                    if i == len(keys) - 1:
-                        current_level[key] = value
-                    else:
-                        if key not in current_level:
-                            current_level[key] = {}
-                        current_level = current_level[key]
-
-        return nested_json
+        with profiler_stage(self.profiler, 'rebuild'):
+            return rebuild_nested(flat_dict)
 
     def _generate_concise_diff(self, old_value: str, new_value: str) -> str:
         """Generates a concise diff string between two strings."""
+        if self.profiler:
+            self.profiler.count('concise_diffs')
+
         # Ensure inputs are strings to avoid TypeError with difflib
         old_value = str(old_value)
         new_value = str(new_value)
@@ -211,7 +239,14 @@ class LocalizationUpdater:
         if not en_str or not pl_str:
             print(f"Attempted to compare null string(s) for key: {key}")
             return False
+
+        if self.profiler:
+            self.profiler.count('rudimentary_checks')
         
+        precomputed = self.precomputed_rudimentary.get((en_str, pl_str))
+        if precomputed is not None:
+            return precomputed
+
         def clean_string(s: str, patterns: List[regex.Pattern]) -> str:
             for pattern in patterns:
                 s = pattern.sub('', s)
@@ -225,10 +260,12 @@ class LocalizationUpdater:
         # if min(len(en_str_cleaned), len(pl_str_cleaned)) < 150:
         #     return False
 
-        similarity_threshold = 0.75
-        matcher = SequenceMatcher(None, en_str_cleaned, pl_str_cleaned)
-        similarity = matcher.ratio()
-        return similarity >= similarity_threshold
+        return similarity_at_least(
+            en_str_cleaned,
+            pl_str_cleaned,
+            self.RUDIMENTARY_SIMILARITY_THRESHOLD,
+            self.similarity_backend
+        )
 
     def _auto_pretranslate(self, en_str: Optional[str], key: Optional[str] = None) -> Optional[str]:
         def save_and_replace_brackets(text):
@@ -264,33 +301,40 @@ class LocalizationUpdater:
                 return match.group(0)
 
             return self.placeholder_pattern.sub(restore_match, modified_text)
-        
-        def replace_with_patterns(text: str, compiled_replacements) -> str:
-            """
-            Replaces occurrences in 'text' using pre-compiled patterns
-            
-            :param text: The original text to process.
-            :param compiled_replacements: A list of tuples where the first element is the compiled regex pattern
-                                        and the second element is the replacement pattern.
-            :return: The modified text after all replacements.
-            """
-            for pattern, replacement in compiled_replacements:
-                text = pattern.sub(replacement, text)
-            return text
+
 
         if en_str is None:
             print(f"Cannot pretranslate empty string for key: {key}")
             return en_str
 
+        if self.profiler:
+            self.profiler.count('pretranslations')
+
+        precomputed = self.precomputed_pretranslations.get(en_str)
+        if precomputed is not None:
+            return precomputed
+
+        cache = self.pretranslation_cache
+        if cache is not None:
+            cached_text = cache.get(en_str)
+            if cached_text is not None:
+                return cached_text
+
         # Step 1: Save and replace bracketed sections with placeholders
         text_with_placeholders, bracketed_texts = save_and_replace_brackets(en_str)
 
-        # Step 2: Apply regex replacements using compiled patterns
-        modified_text = replace_with_patterns(text_with_placeholders, self.compiled_replacement_patterns)
+        # Step 2: Apply glossary and regex replacements in a single engine pass
+        if self.profiler:
+            modified_text = self.glossary_engine.apply_profiled(text_with_placeholders, self.profiler)
+        else:
+            modified_text = self.glossary_engine.apply(text_with_placeholders)
 
         # Step 3: Restore the original bracketed sections
         final_text = restore_bracketed_text(modified_text, bracketed_texts)
 
+        if cache is not None:
+            cache.put(en_str, final_text)
+
         return final_text
     
     def _update_localization(self):
@@ -299,13 +343,58 @@ class LocalizationUpdater:
         en_new_keys_set = set(self.en_extracted.keys())
         
         # Pre-calculate value mappings
-        value_mappings = self._calculate_value_mappings()
+        with profiler_stage(self.profiler, 'value_mappings'):
+            value_mappings = self._calculate_value_mappings()
+
+        if self.use_translation_memory:
+            with profiler_stage(self.profiler, 'translation_memory'):
+                self._load_translation_memory()
+
+        if self.pretranslation_workers > 1:
+            with profiler_stage(self.profiler, 'parallel_precompute'):
+                self._precompute_in_parallel()
         
         # Process new/updated translations
-        self._process_translations(value_mappings)
+        with profiler_stage(self.profiler, 'process_translations'):
+            self._process_translations(value_mappings)
         
         # Remove obsolete keys
-        self._remove_obsolete_keys(en_old_keys_set, en_new_keys_set)
+        with profiler_stage(self.profiler, 'remove_obsolete'):
+            self._remove_obsolete_keys(en_old_keys_set, en_new_keys_set)
+
+    def _load_translation_memory(self):
+        """Opens the translation memory and adds the translations of the current files to it."""
+        self.translation_memory = TranslationMemory(
+            self.translation_memory_path,
+            self.TRANSLATION_MEMORY_THRESHOLD,
+            self.similarity_backend,
+            self.FUZZY_RENAME_MIN_LENGTH
+        )
+        # A Polish value belongs to the English text it was translated from, i.e. the old one
+        self.translation_memory.add_pairs(
+            ((old_value, self.pl_extracted.get(key)) for key, old_value in self.en_old_extracted.items()),
+            self.pl_path
+        )
+
+    def _translate_new_key(self, new_key, new_value, auto_pretranslate):
+        """
+        Translates a new key from the translation memory if it has a close enough
+        match, otherwise by regex pretranslation. Near matches are listed as outdated
+        with a diff against the English text they were translated from.
+        """
+        memory = self.translation_memory
+        hit = memory.lookup(new_value, self.pl_path) if memory is not None and isinstance(new_value, str) else None
+        if hit is None:
+            self.new_keys.append(new_key)
+            return auto_pretranslate(new_value, new_key)
+
+        matched_source, translation, similarity, match_path = hit
+        if self.profiler:
+            self.profiler.count('translation_memory_hits')
+        self.memory_translated_keys.append((new_key, matched_source, similarity, match_path))
+        if matched_source != new_value:
+            self.outdated_keys.append((new_key, self._generate_concise_diff(matched_source, new_value)))
+        return translation
 
     def _calculate_value_mappings(self):
         """Pre-calculate all value mappings for faster lookup"""
@@ -330,20 +419,113 @@ class LocalizationUpdater:
                 for key, value in self.en_old_extracted.items() 
                 if value in unique_old_values
             },
-            'unique_new_values': unique_new_values
+            'unique_new_values': unique_new_values,
+            'fuzzy_renames': self._find_fuzzy_renames(old_value_counts, new_value_counts)
+        }
+
+    def _find_fuzzy_renames(self, old_value_counts, new_value_counts):
+        """
+        Maps added keys to removed keys whose English value changed only slightly.
+        Values still present on the other side are left to the exact rename logic.
+        """
+        removed = {
+            key: value for key, value in self.en_old_extracted.items()
+            if key not in self.en_extracted and value not in new_value_counts
         }
+        added = {
+            key: value for key, value in self.en_extracted.items()
+            if key not in self.en_old_extracted and key not in self.pl_extracted and value not in old_value_counts
+        }
+        if not removed or not added:
+            return {}
+
+        with profiler_stage(self.profiler, 'fuzzy_renames'):
+            return find_fuzzy_renames(
+                removed,
+                added,
+                self.FUZZY_RENAME_THRESHOLD,
+                self.similarity_backend,
+                self.FUZZY_RENAME_MIN_LENGTH
+            )
+
+    def _precompute_in_parallel(self):
+        """
+        Pretranslates the strings _process_translations may need, and runs the
+        rudimentary checks it may make, in chunks across worker processes.
+        The serial loop then only looks the results up, so its outcome is
+        identical to a single-process run.
+
+        Only keys the loop may pretranslate are collected: new keys and
+        changed values, or every key of a new file or a regex translation run.
+        """
+        from parallel_processing import precompute_in_chunks
+
+        cache = self.pretranslation_cache
+        keys_to_visit = self.en_extracted if self.keys_to_visit is None else self.keys_to_visit
+        pretranslate_all = self.is_new_file or self.perform_regex_translate
+        texts = {}
+        for key, new_value in keys_to_visit.items():
+            old_value = self.en_old_extracted.get(key)
+            if pretranslate_all:
+                candidates = [new_value, old_value]
+                if self.perform_regex_translate:
+                    candidates.append(self.pl_extracted.get(key))
+            elif key not in self.pl_extracted:
+                candidates = [new_value]
+            elif old_value is not None and old_value != new_value:
+                # The old value is pretranslated for the rudimentary check
+                candidates = [new_value, old_value]
+            else:
+                continue
+            for text in candidates:
+                if isinstance(text, str) and text not in texts and (cache is None or text not in cache):
+                    texts[text] = None
+        texts = list(texts)
+
+        if len(texts) < self.PARALLEL_MIN_ITEMS:
+            return
+
+        def rudimentary_pairs_for(pretranslations):
+            pairs = {}
+            for key, new_value in keys_to_visit.items():
+                old_value = self.en_old_extracted.get(key)
+                current_pl = self.pl_extracted.get(key)
+                if (isinstance(old_value, str) and isinstance(current_pl, str) and current_pl
+                        and old_value != new_value and current_pl != new_value and current_pl != old_value):
+                    old_pretranslated = pretranslations.get(old_value)
+                    if old_pretranslated is None:
+                        old_pretranslated = self._auto_pretranslate(old_value, key)
+                    if old_pretranslated:
+                        pairs[(old_pretranslated, current_pl)] = None
+            return list(pairs)
+
+        self.precomputed_pretranslations, self.precomputed_rudimentary = precompute_in_chunks(
+            self.selected_patterns,
+            self.similarity_backend,
+            texts,
+            rudimentary_pairs_for,
+            self.pretranslation_workers,
+            self.PARALLEL_CHUNK_SIZE,
+            pretranslate_results_twice=self.perform_regex_translate
+        )
+
+        if cache is not None:
+            for text, result in self.precomputed_pretranslations.items():
+                cache.put(text, result)
 
     def _process_translations(self, value_mappings):
         """Process all translations with optimized lookups"""
         old_to_key = value_mappings['old_to_key']
         unique_new_values = value_mappings['unique_new_values']
+        fuzzy_renames = value_mappings['fuzzy_renames']
 
         # Cache frequently accessed methods
         auto_pretranslate = self._auto_pretranslate
         is_translation_rudimentary = self._is_translation_rudimentary
         
+        keys_to_visit = self.en_extracted if self.keys_to_visit is None else self.keys_to_visit
         for new_key, new_value in tqdm(
-            self.en_extracted.items(), 
+            keys_to_visit.items(), 
             desc=f"Processing {self.log_identifier}"
         ):
             # rename key if both before and after the value is unique
@@ -377,10 +559,11 @@ class LocalizationUpdater:
                         is_translation_rudimentary
                     )
 
-            # if value does not exist in translation, add it
+            # if value does not exist in translation, carry it over from a fuzzy rename or add it
             elif new_key not in self.pl_extracted:
-                self.pl_extracted[new_key] = auto_pretranslate(new_value, new_key)
-                self.new_keys.append(new_key)
+                old_key = fuzzy_renames.get(new_key)
+                if old_key is None or not self._handle_fuzzy_rename(new_key, old_key, new_value):
+                    self.pl_extracted[new_key] = self._translate_new_key(new_key, new_value, auto_pretranslate)
 
             if self.perform_regex_translate and new_key in self.pl_extracted:
                 self.pl_extracted[new_key] = auto_pretranslate(self.pl_extracted[new_key], new_key)
@@ -409,6 +592,9 @@ class LocalizationUpdater:
 
     def _handle_key_rename(self, new_key, old_key):
         """Handle key rename operations"""
+        if self.profiler:
+            self.profiler.count('key_renames')
+
         if old_key not in self.pl_extracted:
             print(f"Did not find old key {old_key} in {self.log_identifier}. "
                   "It may have been updated already")
@@ -418,6 +604,25 @@ class LocalizationUpdater:
         del self.pl_extracted[old_key]  # Remove the old key after renaming
         self.renamed_keys.append((old_key, new_key))
 
+    def _handle_fuzzy_rename(self, new_key, old_key, new_value):
+        """
+        Moves the translation of 'old_key' to 'new_key' and flags it for review.
+        Returns False if there is no translation worth keeping.
+        """
+        old_en_value = self.en_old_extracted.get(old_key)
+        current_pl = self.pl_extracted.get(old_key)
+        if current_pl is None or current_pl == old_en_value:
+            return False
+
+        if self.profiler:
+            self.profiler.count('fuzzy_renames')
+
+        self.pl_extracted[new_key] = current_pl
+        del self.pl_extracted[old_key]
+        self.fuzzy_renamed_keys.append((old_key, new_key))
+        self.outdated_keys.append((new_key, self._generate_concise_diff(old_en_value, new_value)))
+        return True
+
     def _remove_obsolete_keys(self, en_old_keys_set, en_new_keys_set):
         """Remove obsolete keys efficiently"""
         # remove obsolete keys
@@ -476,39 +681,131 @@ class LocalizationUpdater:
 
     def process(self, perform_regex_translate):
         """Main processing method for localization updates"""
+        self.perform_regex_translate = perform_regex_translate
+
         # Load and validate input files
         if not self._load_and_validate_files():
             return
 
         # Compile regex patterns based on loaded content
-        self._compile_patterns()
+        with profiler_stage(self.profiler, 'compile_patterns'):
+            self._compile_patterns()
 
-        self.perform_regex_translate = perform_regex_translate
-        self._update_localization()
+        try:
+            self._update_localization()
+        finally:
+            if self.translation_memory is not None:
+                self.translation_memory.close()
+            if self.pretranslation_cache is not None:
+                self.pretranslation_cache.close()
+                if self.profiler:
+                    self.profiler.count('cache_hits', self.pretranslation_cache.hits)
+                    self.profiler.count('cache_misses', self.pretranslation_cache.misses)
 
         # Only log if changes exist
         if self._has_any_changes():
-            self._log_changes()
+            with profiler_stage(self.profiler, 'log_changes'):
+                self._log_changes()
     
         # Sort and save the final dictionary
-        self._sort_and_save_translations()
+        with profiler_stage(self.profiler, 'sort_and_save'):
+            self._sort_and_save_translations()
+
+        if self.en_version is not None:
+            history = EnglishHistory(self.english_history_path)
+            history.set_translation_base(self.pl_path, self.en_path, self.en_version)
+            history.close()
 
     def _load_and_validate_files(self):
         """Load and validate all required localization files"""
-        if os.path.exists(self.en_old_path):
-            self.en_old_extracted = self._extract_localization_dict(self._get_file_from_directory(self.en_old_path))
+        if self.previous_state is not None:
+            # Incremental mode compares nested subtrees, so it needs the parsed trees
+            en_old_data = self._get_file_from_directory(self.en_old_path) if os.path.exists(self.en_old_path) else None
+            en_data = self._get_file_from_directory(self.en_path)
+            pl_data = self._get_file_from_directory(self.pl_path)
+
+            self.en_old_extracted = self._extract_localization_dict(en_old_data)
+            self.en_extracted = self._extract_localization_dict(en_data)
+            self.pl_extracted = self._extract_localization_dict(pl_data)
         else:
-            self.en_old_extracted = {} # Treat as empty if it doesn't exist
+            self.en_old_extracted = self._load_flat_file(self.en_old_path) if os.path.exists(self.en_old_path) else None
+            self.en_extracted = self._load_flat_file(self.en_path)
+            self.pl_extracted = self._load_flat_file(self.pl_path)
 
-        self.en_extracted = self._extract_localization_dict(self._get_file_from_directory(self.en_path))
-        self.pl_extracted = self._extract_localization_dict(self._get_file_from_directory(self.pl_path))
+        # Treat a missing old English file as empty
+        if self.en_old_extracted is None:
+            self.en_old_extracted = {}
 
         if self.en_extracted is None or self.pl_extracted is None:
             logging.info(f"{self.log_identifier}:")
             logging.error("Unable to proceed due to missing 'en' or 'pl' data.")
             return False
+
+        with profiler_stage(self.profiler, 'english_history'):
+            used_translation_base = self._apply_english_history()
+
+        if self.previous_state is not None and not used_translation_base:
+            self._select_changed_subtrees(en_old_data, en_data, pl_data)
+
+        # The dicts keep sharing their key objects; the lookup table itself is no longer needed
+        self.shared_keys.clear()
+        return True
+
+    def _apply_english_history(self) -> bool:
+        """
+        Records the old and new English files as versions in the English
+        history. If the Polish file was last updated against a different
+        English version than the old file (an interrupted run, skipped
+        releases), that version replaces the old English values, so changes
+        are found relative to the English the translation was made from.
+
+        Returns True if the old English values were replaced.
+        """
+        if self.english_history_path is None:
+            return False
+
+        history = EnglishHistory(self.english_history_path)
+        try:
+            old_version = history.add_version(self.en_path, self.en_old_extracted) if self.en_old_extracted else None
+            self.en_version = history.add_version(self.en_path, self.en_extracted)
+            base_version = history.get_translation_base(self.pl_path, self.en_path)
+            if base_version is None or base_version == old_version:
+                return False
+            base = history.get_version(self.en_path, base_version, self.shared_keys)
+        finally:
+            history.close()
+
+        if base is None:
+            return False
+        logging.info(f"{self.log_identifier}: comparing against English version {base_version}, which the Polish file was last updated from")
+        self.en_old_extracted = base
         return True
 
+    def _select_changed_subtrees(self, en_old_data, en_data, pl_data):
+        """
+        Limits _process_translations to the top-level subtrees that may need work.
+
+        A subtree is skipped when its English content is identical in the old
+        and new English files and its Polish content is identical to what the
+        previous run saved. Processing such keys would not change anything.
+        """
+        if self.perform_regex_translate or not isinstance(en_data, dict):
+            return
+
+        en_old_hashes = subtree_hashes(en_old_data)
+        en_hashes = subtree_hashes(en_data)
+        pl_hashes = subtree_hashes(pl_data)
+        previous_pl_hashes = self.previous_state.get('pl_subtrees', {})
+
+        changed_subtrees = {
+            key: value for key, value in en_data.items()
+            if not (en_hashes[key] == en_old_hashes.get(key)
+                    and pl_hashes.get(key) is not None
+                    and pl_hashes.get(key) == previous_pl_hashes.get(key))
+        }
+        if len(changed_subtrees) < len(en_data):
+            self.keys_to_visit = self._extract_localization_dict(changed_subtrees)
+
     def _apply_regex_translations(self):
         """Apply regex translations to all records"""
         for key, value in tqdm(self.pl_extracted.items(), 
@@ -521,10 +818,12 @@ class LocalizationUpdater:
             self.new_keys,
             self.removed_keys,
             self.renamed_keys,
+            self.fuzzy_renamed_keys,
             self.updated_eng_keys,
             self.outdated_keys,
             self.review_needed_keys,
             self.rudimentary_translations_updated,
+            self.memory_translated_keys,
         ])
     
     def _has_notable_changes(self):
@@ -540,6 +839,10 @@ class LocalizationUpdater:
         if not has_changes:
             return
 
+        # The section header goes before the first file with something to log
+        if self.logger:
+            self.logger.print_header_if_needed()
+
         # Log the processed file name
         logging.info(f"{self.log_identifier}:")
         
@@ -563,6 +866,19 @@ class LocalizationUpdater:
                 for old_key, new_key in self.renamed_keys:
                     logging.info(f"    {old_key} -> {new_key}")
 
+            if self.memory_translated_keys:
+                logging.info(f"  Added keys translated from translation memory: {len(self.memory_translated_keys)}")
+                for key, matched_source, similarity, match_path in self.memory_translated_keys:
+                    match = "exact" if similarity == 1.0 else f"{similarity:.0%} similar, listed as outdated"
+                    if match_path != self.pl_path:
+                        match += f", from {match_path or 'an unknown file'}"
+                    logging.info(f"    {key} ({match})")
+
+            if self.fuzzy_renamed_keys:
+                logging.info(f"  Renamed keys with changed value (transferred, listed as outdated): {len(self.fuzzy_renamed_keys)}")
+                for old_key, new_key in self.fuzzy_renamed_keys:
+                    logging.info(f"    {old_key} -> {new_key}")
+
         # Always log outdated keys
         if self.outdated_keys:
             logging.info(f"  Outdated records: {len(self.outdated_keys)}")
@@ -598,21 +914,23 @@ class LocalizationUpdater:
         }
         
         self.pl_extracted = ordered_pl
+        nested_pl = self._rebuild_nested_json(self.pl_extracted)
+        nested_en = self._rebuild_nested_json(self.en_extracted)
 
         # Save the final result for Polish file
-        self._save_file_to_directory(
-            self.pl_path,
-            self._rebuild_nested_json(self.pl_extracted)
-        )
-
-        # Also save the English source file to ensure consistent formatting
-        self._save_file_to_directory(
-            self.en_path, # Save back to the source English path
-            self._rebuild_nested_json(self.en_extracted)
-        )
-
-        # Update old files to latest
-        self._save_file_to_directory(
-            self.en_old_path, # Save back to the source English path
-            self._rebuild_nested_json(self.en_extracted)
-        )
\ No newline at end of file
+        self._save_file_to_directory(self.pl_path, nested_pl)
+
+        # Also save the English source file to ensure consistent formatting,
+        # and update old files to latest, both from one serialization
+        with profiler_stage(self.profiler, 'save_json'):
+            en_content = serialize_json(nested_en, self.json_backend)
+        self._save_serialized_file(self.en_path, en_content)
+        self._save_serialized_file(self.en_old_path, en_content)
+
+        if self.previous_state is not None:
+            self.saved_state = {
+                'en': file_hash(self.en_path),
+                'pl': file_hash(self.pl_path),
+                'en_subtrees': subtree_hashes(nested_en),
+                'pl_subtrees': subtree_hashes(nested_pl),
+            }
\ No newline at end of file
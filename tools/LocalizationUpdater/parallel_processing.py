@@ -0,0 +1,179 @@
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler
+from typing import Dict, List, Tuple
+
+from glossary_engine import GlossaryEngine
+from localization_updater import LocalizationUpdater
+
+# Log queue shared with the worker processes, set up by _init_worker
+_worker_log_queue = None
+# Queued in place of a record where the updater asks for the section header
+HEADER_REQUEST = 'header'
+
+
+class PairQueueHandler(QueueHandler):
+    """Queue handler that tags every record with the index of the file pair that produced it."""
+
+    def __init__(self, log_queue, pair_index: int):
+        super().__init__(log_queue)
+        self.pair_index = pair_index
+
+    def enqueue(self, record):
+        self.queue.put((self.pair_index, record))
+
+
+class QueuedSectionHeader:
+    """Stands in for the parent's SectionalLogger, queueing its header request in order with the pair's records."""
+
+    def __init__(self, log_queue, pair_index: int):
+        self.queue = log_queue
+        self.pair_index = pair_index
+
+    def print_header_if_needed(self):
+        self.queue.put((self.pair_index, HEADER_REQUEST))
+
+
+def _init_worker(log_queue):
+    global _worker_log_queue
+    _worker_log_queue = log_queue
+
+
+def _process_pair(pair_index: int, updater_args: Dict, perform_regex_translate: bool):
+    """Runs a single LocalizationUpdater in a worker, routing its log records to the parent."""
+    root_logger = logging.getLogger()
+    root_logger.handlers = [PairQueueHandler(_worker_log_queue, pair_index)]
+    root_logger.setLevel(logging.INFO)
+
+    try:
+        updater = LocalizationUpdater(**updater_args, logger=QueuedSectionHeader(_worker_log_queue, pair_index))
+        updater.process(perform_regex_translate)
+        return updater.profiler.to_dict() if updater.profiler else None, updater.saved_state
+    finally:
+        # Sentinel: everything logged for this pair has been queued
+        _worker_log_queue.put((pair_index, None))
+
+
+def process_pairs_in_parallel(tasks: List[Dict], perform_regex_translate: bool, jobs: int, logger=None):
+    """
+    Processes each file pair in its own worker process.
+
+    Log records are collected from the workers through a queue and replayed
+    into the parent's handlers grouped per file pair, in the original pair
+    order, so the log reads the same as a serial run. Where a worker's
+    updater asks for the section header, 'logger' prints it, as the serial
+    run does at the same point.
+
+    Returns each pair's (profiling report, saved manifest state) in task order.
+    """
+    log_queue = multiprocessing.Queue()
+    records_by_pair = {index: [] for index in range(len(tasks))}
+    finished_pairs = set()
+    next_pair_to_flush = 0
+
+    def flush_finished_pairs():
+        nonlocal next_pair_to_flush
+        while next_pair_to_flush in finished_pairs:
+            for record in records_by_pair.pop(next_pair_to_flush):
+                if record == HEADER_REQUEST:
+                    if logger is not None:
+                        logger.print_header_if_needed()
+                else:
+                    logging.getLogger(record.name).handle(record)
+            next_pair_to_flush += 1
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(log_queue,)) as executor:
+        futures = [
+            executor.submit(_process_pair, index, updater_args, perform_regex_translate)
+            for index, updater_args in enumerate(tasks)
+        ]
+
+        while len(finished_pairs) < len(tasks):
+            try:
+                pair_index, record = log_queue.get(timeout=1)
+            except queue.Empty:
+                # A worker that died abruptly never sends its sentinel
+                for index, future in enumerate(futures):
+                    if future.done() and future.exception() is not None:
+                        finished_pairs.add(index)
+                flush_finished_pairs()
+                continue
+
+            if record is None:
+                finished_pairs.add(pair_index)
+                flush_finished_pairs()
+            elif pair_index in records_by_pair:
+                records_by_pair[pair_index].append(record)
+
+        results = []
+        for task, future in zip(tasks, futures):
+            if future.exception() is not None:
+                logging.error(f"{task['log_identifier']}: processing failed: {future.exception()}")
+                results.append((None, None))
+            else:
+                results.append(future.result())
+
+    return results
+
+
+# Per-worker updater used for chunked pretranslation, set up by _init_chunk_worker
+_chunk_worker_updater = None
+
+
+def _init_chunk_worker(patterns: List[Tuple[str, str]], similarity_backend: str):
+    """Compiles the glossary once per worker instead of once per chunk."""
+    global _chunk_worker_updater
+    _chunk_worker_updater = LocalizationUpdater('', '', '', False, 'worker', similarity_backend=similarity_backend)
+    _chunk_worker_updater.glossary_engine = GlossaryEngine(patterns)
+
+
+def _pretranslate_chunk(texts: List[str]) -> List[str]:
+    return [_chunk_worker_updater._auto_pretranslate(text) for text in texts]
+
+
+def _check_rudimentary_chunk(pairs: List[Tuple[str, str]]) -> List[bool]:
+    return [_chunk_worker_updater._is_translation_rudimentary(en_str, pl_str) for en_str, pl_str in pairs]
+
+
+def _chunks(items: List, chunk_size: int):
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def _map_in_chunks(executor, function, items: List, chunk_size: int) -> List:
+    results = []
+    for chunk_results in executor.map(function, _chunks(items, chunk_size)):
+        results.extend(chunk_results)
+    return results
+
+
+def precompute_in_chunks(patterns: List[Tuple[str, str]], similarity_backend: str, texts: List[str],
+                         rudimentary_pairs_for, workers: int, chunk_size: int,
+                         pretranslate_results_twice: bool = False):
+    """
+    Pretranslates 'texts' and runs rudimentary checks in a process pool.
+
+    'rudimentary_pairs_for' receives the text -> pretranslation mapping of the
+    first round and returns the (en_str, pl_str) pairs to check. Results are
+    merged back in input order. With 'pretranslate_results_twice', outputs
+    that are themselves pretranslated again (as --PerformRegexTranslate does)
+    are computed in a second round.
+
+    Returns the (text -> pretranslation, (en_str, pl_str) -> bool) mappings.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker,
+                             initargs=(patterns, similarity_backend)) as executor:
+        pretranslations = dict(zip(texts, _map_in_chunks(executor, _pretranslate_chunk, texts, chunk_size)))
+
+        if pretranslate_results_twice:
+            second_round = list(dict.fromkeys(
+                result for result in pretranslations.values() if result not in pretranslations
+            ))
+            pretranslations.update(zip(second_round, _map_in_chunks(executor, _pretranslate_chunk, second_round, chunk_size)))
+
+        pairs = rudimentary_pairs_for(pretranslations)
+        rudimentary = dict(zip(pairs, _map_in_chunks(executor, _check_rudimentary_chunk, pairs, chunk_size)))
+
+    return pretranslations, rudimentary
@@ -0,0 +1,117 @@
+import os
+import time
+import hashlib
+import logging
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+# Bump when _auto_pretranslate changes in a way that alters its output
+# for the same patterns, so that old cache entries stop matching.
+PRETRANSLATION_ALGORITHM_VERSION = 1
+
+
+def patterns_fingerprint(patterns: List[Tuple[str, str]]) -> str:
+    """Stable hash of an ordered pattern set, used to key cache entries."""
+    digest = hashlib.sha256(f"v{PRETRANSLATION_ALGORITHM_VERSION}".encode('utf-8'))
+    for pattern, replacement in patterns:
+        digest.update(b'\0')
+        digest.update(pattern.encode('utf-8'))
+        digest.update(b'\1')
+        digest.update(replacement.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PretranslationCache:
+    """
+    On-disk memo of _auto_pretranslate results, stored in SQLite.
+
+    Entries are keyed by (pattern set fingerprint, source text), so editing a
+    pattern set only invalidates the entries produced with it. All entries
+    for the active fingerprint are loaded once on open; new results and the
+    usage timestamps of hit entries are written back on close, after which
+    the least recently used entries beyond 'max_entries' are evicted.
+    """
+
+    DEFAULT_MAX_ENTRIES = 200_000
+
+    def __init__(self, db_path: str, fingerprint: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: Dict[str, str] = {}
+        self._used: set = set()
+        self._new_entries: Dict[str, str] = {}
+        self._connection = None
+
+        try:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(db_path, timeout=30)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pretranslations ("
+                " fingerprint TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (fingerprint, source))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS pretranslations_last_used ON pretranslations (last_used)"
+            )
+            self._entries = dict(self._connection.execute(
+                "SELECT source, result FROM pretranslations WHERE fingerprint = ?",
+                (fingerprint,)
+            ))
+        except sqlite3.Error as e:
+            logging.error(f"Pretranslation cache at {db_path} is unavailable: {str(e)}")
+            self._connection = None
+
+    def get(self, source: str) -> Optional[str]:
+        result = self._entries.get(source)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used.add(source)
+        return result
+
+    def __contains__(self, source: str) -> bool:
+        """Checks for a result without counting a hit or miss or marking it as used."""
+        return source in self._entries
+
+    def put(self, source: str, result: str):
+        self._entries[source] = result
+        self._new_entries[source] = result
+
+    def close(self):
+        """Writes back new entries and usage times, then applies LRU eviction."""
+        if self._connection is None:
+            return
+
+        now = time.time()
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO pretranslations (fingerprint, source, result, last_used) VALUES (?, ?, ?, ?)",
+                    ((self.fingerprint, source, result, now) for source, result in self._new_entries.items())
+                )
+                self._connection.executemany(
+                    "UPDATE pretranslations SET last_used = ? WHERE fingerprint = ? AND source = ?",
+                    ((now, self.fingerprint, source) for source in self._used - self._new_entries.keys())
+                )
+                self._connection.execute(
+                    "DELETE FROM pretranslations WHERE rowid IN ("
+                    " SELECT rowid FROM pretranslations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update pretranslation cache at {self.db_path}: {str(e)}")
+        finally:
+            self._connection.close()
+            self._connection = None
+            self._new_entries = {}
+            self._used = set()
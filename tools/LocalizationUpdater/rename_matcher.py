@@ -0,0 +1,92 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Set
+
+from similarity import similarity_at_least
+
+NGRAM_SIZE = 3
+# Only this many best n-gram candidates of each added key are compared with the exact ratio
+MAX_CANDIDATES = 5
+# Postings longer than this belong to n-grams too common to tell values apart
+MAX_POSTINGS = 1000
+# Candidates sharing fewer n-grams than this (dice coefficient) are not worth an exact comparison
+MIN_NGRAM_SIMILARITY = 0.5
+
+
+def _ngrams(text: str) -> Set[str]:
+    text = text.lower()
+    return {text[i:i + NGRAM_SIZE] for i in range(max(len(text) - NGRAM_SIZE + 1, 1))}
+
+
+def _key_path_similarity(old_key: str, new_key: str) -> float:
+    return SequenceMatcher(None, old_key.split('.'), new_key.split('.')).ratio()
+
+
+class NGramIndex:
+    """Inverted index from character n-grams to the keys whose values contain them."""
+
+    def __init__(self):
+        self.postings: Dict[str, List[str]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+
+    def add(self, key: str, text: str):
+        grams = _ngrams(text)
+        self.grams[key] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(key)
+
+    def candidates(self, text: str, limit: int):
+        """
+        Returns up to 'limit' (dice coefficient, key) pairs for the keys sharing
+        the most distinctive n-grams with 'text', best coefficient first.
+        """
+        grams = _ngrams(text)
+        shared = Counter()
+        for gram in grams:
+            keys = self.postings.get(gram)
+            if keys and len(keys) <= MAX_POSTINGS:
+                shared.update(keys)
+        candidates = []
+        for key, _ in shared.most_common(limit):
+            key_grams = self.grams[key]
+            candidates.append((2.0 * len(grams & key_grams) / (len(grams) + len(key_grams)), key))
+        candidates.sort(reverse=True)
+        return candidates
+
+
+def find_fuzzy_renames(removed: Dict[str, str], added: Dict[str, str], threshold: float,
+                       backend: str = 'difflib', min_length: int = 0) -> Dict[str, str]:
+    """
+    Pairs removed keys with added keys whose values are similar but not equal.
+
+    Candidates come from an n-gram index over the removed values, so each
+    added value is only compared with a few likely matches instead of every
+    removed one. A candidate must reach 'threshold' with the same similarity
+    check used for rudimentary translations. Pairs are then assigned one to
+    one, best value similarity first, with key path similarity as tiebreaker.
+
+    Returns {new_key: old_key}.
+    """
+    index = NGramIndex()
+    for old_key, value in removed.items():
+        if isinstance(value, str) and len(value) >= min_length:
+            index.add(old_key, value)
+    if not index.grams:
+        return {}
+
+    proposals = []
+    for new_key, value in added.items():
+        if not isinstance(value, str) or len(value) < min_length:
+            continue
+        for dice, old_key in index.candidates(value, MAX_CANDIDATES):
+            if dice >= MIN_NGRAM_SIMILARITY and similarity_at_least(removed[old_key], value, threshold, backend):
+                ratio = SequenceMatcher(None, removed[old_key], value).ratio()
+                proposals.append((ratio, _key_path_similarity(old_key, new_key), new_key, old_key))
+
+    renames = {}
+    used_old_keys = set()
+    for _, _, new_key, old_key in sorted(proposals, key=lambda proposal: (-proposal[0], -proposal[1], proposal[2], proposal[3])):
+        if new_key not in renames and old_key not in used_old_keys:
+            renames[new_key] = old_key
+            used_old_keys.add(old_key)
+    return renames
@@ -0,0 +1,45 @@
+from difflib import SequenceMatcher
+
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
+
+# Both backends give exactly the result of SequenceMatcher.ratio() >= threshold.
+# 'rapidfuzz' adds the compiled Indel (LCS-based) similarity as a cheap upper
+# bound: it is never lower than ratio(), so pairs below it are rejected without
+# running difflib, and only the remaining pairs are confirmed with ratio().
+SIMILARITY_BACKENDS = ('difflib', 'rapidfuzz')
+
+
+def is_backend_available(backend: str) -> bool:
+    if backend == 'rapidfuzz':
+        return Indel is not None
+    return backend == 'difflib'
+
+
+def similarity_at_least(a: str, b: str, threshold: float, backend: str = 'difflib') -> bool:
+    """
+    Checks whether the similarity ratio of 'a' and 'b' reaches 'threshold'.
+
+    Cheap upper bounds are tried first, so the quadratic ratio computation
+    only runs for pairs that the bounds cannot reject:
+      1. identical strings are always similar,
+      2. length ratio (same value as SequenceMatcher.real_quick_ratio()),
+      3. Indel similarity with the 'rapidfuzz' backend,
+      4. character multiset overlap (SequenceMatcher.quick_ratio()).
+    """
+    if a == b:
+        return True
+
+    len_a, len_b = len(a), len(b)
+    if 2.0 * min(len_a, len_b) / (len_a + len_b) < threshold:
+        return False
+
+    if backend == 'rapidfuzz' and Indel.normalized_similarity(a, b, score_cutoff=threshold) < threshold:
+        return False
+
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.quick_ratio() < threshold:
+        return False
+    return matcher.ratio() >= threshold
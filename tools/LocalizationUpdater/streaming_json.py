@@ -0,0 +1,207 @@
+import os
+import re
+import mmap
+import codecs
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+from typing import Dict, Iterator, Optional, Tuple
+
+from flat_keys import child_flat_key
+
+# Bytes of the mapped file decoded per refill of the text window
+CHUNK_SIZE = 1 << 20
+# Longest literal (-Infinity); at least this much text is buffered before matching one
+_MAX_LITERAL_LENGTH = 9
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters a number can contain; a number is only matched once one is followed by something else
+_NUMBER_CHARS = re.compile(r'[0-9+\-.eE]*')
+# An object entry whose key and value are strings without escapes, followed by ',' or the closing '}'
+_PLAIN_ENTRY = re.compile(r'[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*(?:(,)|(?=\}))')
+_LITERALS = (
+    ('null', None),
+    ('true', True),
+    ('false', False),
+    ('NaN', float('nan')),
+    ('Infinity', float('inf')),
+    ('-Infinity', float('-inf')),
+)
+_CLOSING = {'{': '}', '[': ']'}
+
+
+class _MappedText:
+    """
+    Decoded text of a memory-mapped UTF-8 file, held as a window that slides
+    forward as the parser consumes it. Only the unparsed remainder and the
+    next chunk are ever in memory as a str.
+    """
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.read_offset = 0
+        self.text = ''
+        self.pos = 0
+        # Characters dropped from the front of the window, for error positions
+        self.consumed = 0
+        self.eof = False
+
+    def refill(self) -> bool:
+        """Appends the next chunk to the window. Returns False at the end of the file."""
+        if self.eof:
+            return False
+        # Grow with the unparsed remainder, so a token spanning many chunks is rescanned only a few times
+        size = max(CHUNK_SIZE, len(self.text) - self.pos)
+        chunk = self.mapped[self.read_offset:self.read_offset + size]
+        self.read_offset += len(chunk)
+        self.eof = self.read_offset >= len(self.mapped)
+        self.consumed += self.pos
+        self.text = self.text[self.pos:] + self.decoder.decode(chunk, self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or '' at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self.refill():
+                return self.text[self.pos:self.pos + 1]
+
+    def error(self, message: str, pos: Optional[int] = None) -> ValueError:
+        return ValueError(f"{message}: char {self.consumed + (self.pos if pos is None else pos)}")
+
+    def read_string(self) -> str:
+        """Reads the string starting at the current '"'."""
+        while True:
+            try:
+                value, end = scanstring(self.text, self.pos + 1)
+            except ValueError as e:
+                # The window may end inside the string; only an error at the end of the file is real
+                if self.refill():
+                    continue
+                raise self.error(e.msg, e.pos) from None
+            self.pos = end
+            return value
+
+    def read_scalar(self):
+        """Reads a number or a literal, like the json module's scanner."""
+        while len(self.text) - self.pos < _MAX_LITERAL_LENGTH and self.refill():
+            pass
+        for literal, value in _LITERALS:
+            if self.text.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return value
+
+        # The window may end inside the number, e.g. right after its '.' or 'e'
+        while _NUMBER_CHARS.match(self.text, self.pos).end() == len(self.text) and self.refill():
+            pass
+        match = NUMBER_RE.match(self.text, self.pos)
+        if match is None:
+            raise self.error("Expecting value")
+        integer, fraction, exponent = match.groups()
+        self.pos = match.end()
+        if fraction or exponent:
+            return float(integer + (fraction or '') + (exponent or ''))
+        return int(integer)
+
+    def read_entry_path(self, frame: list) -> str:
+        """Reads up to the next value of the container 'frame' and returns its flat key."""
+        path, is_list, index = frame
+        if is_list:
+            frame[2] = index + 1
+            return f"{path}{{{index}}}"
+
+        if self.peek() != '"':
+            raise self.error("Expecting property name enclosed in double quotes")
+        key = self.read_string()
+        if self.peek() != ':':
+            raise self.error("Expecting ':' delimiter")
+        self.pos += 1
+        return child_flat_key(path, key)
+
+
+def _iter_items(reader: _MappedText, shared_keys: Optional[Dict[str, str]]) -> Iterator[Tuple[str, object]]:
+    share_key = shared_keys.setdefault if shared_keys is not None else None
+    # Open containers as [flat key, is list, next list index]
+    stack = []
+    path = ''
+
+    while True:
+        # A value starts here, and 'path' is its flat key
+        char = reader.peek()
+        if char in _CLOSING:
+            reader.pos += 1
+            frame = [path, char == '[', 0]
+            if reader.peek() != _CLOSING[char]:
+                stack.append(frame)
+                path = reader.read_entry_path(frame)
+                continue
+            # Empty containers have no flat keys
+            reader.pos += 1
+        else:
+            value = reader.read_string() if char == '"' else reader.read_scalar()
+            if share_key is not None:
+                path = share_key(path, path)
+            yield path, value
+
+        # The value is complete; close finished containers until the next entry starts
+        while stack:
+            frame = stack[-1]
+            char = reader.peek()
+            if char == ',':
+                reader.pos += 1
+                if not frame[1]:
+                    # Fast path: most entries are a plain string, matched whole without a refill
+                    text, parent = reader.text, frame[0]
+                    match = _PLAIN_ENTRY.match(text, reader.pos)
+                    while match is not None:
+                        key, value, comma = match.groups()
+                        path = child_flat_key(parent, key)
+                        if share_key is not None:
+                            path = share_key(path, path)
+                        yield path, value
+                        reader.pos = match.end()
+                        if comma is None:
+                            break
+                        match = _PLAIN_ENTRY.match(text, reader.pos)
+                    if match is not None:
+                        # Stopped before the closing '}'
+                        continue
+                path = reader.read_entry_path(frame)
+                break
+            if char == (']' if frame[1] else '}'):
+                reader.pos += 1
+                stack.pop()
+                continue
+            raise reader.error("Expecting ',' delimiter")
+        else:
+            if reader.peek():
+                raise reader.error("Extra data")
+            return
+
+
+def iter_flat_items(filepath: str, shared_keys: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Yields (flat_key, value) for every leaf of a JSON file in document order,
+    with the same key encoding as flatten_localization.
+
+    The file is memory-mapped and parsed event by event, so no nested tree
+    is built and only a window of the decoded text is held at a time.
+    Strings are decoded by the json module's own scanner. Unlike json.load,
+    a duplicated key holding an object merges with the earlier object
+    instead of replacing it.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Expecting value: char 0")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from _iter_items(_MappedText(mapped), shared_keys)
+
+
+def load_flat_json(filepath: str, shared_keys: Optional[Dict[str, str]] = None) -> Optional[Dict[str, object]]:
+    """Streaming equivalent of flatten_localization(json.load(file)); see iter_flat_items."""
+    result = dict(iter_flat_items(filepath, shared_keys))
+    # flatten_localization has no keys for a file holding only null
+    if len(result) == 1 and '' in result and result[''] is None:
+        return None
+    return result
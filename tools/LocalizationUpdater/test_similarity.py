@@ -0,0 +1,74 @@
+import os
+import json
+from difflib import SequenceMatcher
+
+import pytest
+
+from similarity import SIMILARITY_BACKENDS, is_backend_available, similarity_at_least
+from flat_keys import flatten_localization
+
+LANG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lang')
+THRESHOLD = 0.75
+
+BACKENDS = [backend for backend in SIMILARITY_BACKENDS if is_backend_available(backend)]
+
+
+def _load_flat(*path):
+    with open(os.path.join(LANG_DIR, *path), 'r', encoding='utf-8') as f:
+        return flatten_localization(json.load(f))
+
+
+def _lang_pairs():
+    en = _load_flat('en', 'en.json')
+    pl = _load_flat('pl', 'pl.json')
+    return [
+        (en_value, pl[key])
+        for key, en_value in en.items()
+        if isinstance(en_value, str) and isinstance(pl.get(key), str)
+    ]
+
+
+def _expected(a, b, threshold=THRESHOLD):
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_matches_ratio_on_lang_pairs(backend):
+    pairs = _lang_pairs()
+    assert pairs
+    mismatches = [(a, b) for a, b in pairs if similarity_at_least(a, b, THRESHOLD, backend) != _expected(a, b)]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('a, b', [
+    ('', ''),
+    ('', 'Text'),
+    ('Text', ''),
+    ('Same text', 'Same text'),
+    ('Attack', 'Atak'),
+    ('Roll damage', 'Rzut obrażeń'),
+])
+def test_edge_cases(backend, a, b):
+    assert similarity_at_least(a, b, THRESHOLD, backend) == _expected(a, b)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_long_strings_with_autojunk(backend):
+    # Above 200 characters SequenceMatcher treats popular characters as junk,
+    # which lowers ratio() below the plain LCS similarity
+    base = "The token moves across the grid and the scene updates the vision of all tokens. " * 4
+    variants = [
+        base,
+        base.replace('token', 'żeton'),
+        base.replace('the', 'ten'),
+        base[::-1],
+        'e' * 250,
+        'e' * 150 + 'a' * 150,
+        ' '.join(reversed(base.split())),
+    ]
+    for a in variants:
+        for b in variants:
+            assert len(a) > 200 and len(b) > 200
+            for threshold in (0.5, THRESHOLD, 0.9):
+                assert similarity_at_least(a, b, threshold, backend) == _expected(a, b, threshold), (a[:30], b[:30], threshold)
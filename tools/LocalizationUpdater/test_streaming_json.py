@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+import streaming_json
+from streaming_json import load_flat_json
+from flat_keys import flatten_localization
+
+DOCUMENTS = [
+    '{"n": -35000000000.0, "m": 1.5e-10, "k": 12345678901E+5}',
+    '{"a": {"b": [1, 22, -333, 4.25, true, false, null]}, "c": "text"}',
+    '{"escaped": "line\\nbreak \\"quoted\\" \\u0105", "plain": "zażółć", "list": [[], {}, [0.5e3]]}',
+    '{"a": {".dot": "x", " space": "y"}, "b.": {" c": "z"}}',
+    '[-Infinity, Infinity, 0, -0.0, 7]',
+]
+
+
+def _expected(text):
+    return flatten_localization(json.loads(text))
+
+
+@pytest.mark.parametrize('text', DOCUMENTS)
+@pytest.mark.parametrize('padding', range(12))
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 8, 13])
+def test_matches_flatten_across_chunk_boundaries(tmp_path, monkeypatch, text, padding, chunk_size):
+    # Leading whitespace moves every token against the chunk boundaries
+    monkeypatch.setattr(streaming_json, 'CHUNK_SIZE', chunk_size)
+    path = tmp_path / 'data.json'
+    path.write_text(' ' * padding + text, encoding='utf-8')
+    assert load_flat_json(str(path)) == _expected(text)
+
+
+@pytest.mark.parametrize('padding', range(-16, 16))
+def test_number_split_at_default_chunk_size(tmp_path, padding):
+    # A number whose '.' ends the first window of the real chunk size
+    prefix = '{"k": "' + 'x' * (streaming_json.CHUNK_SIZE - 20 + padding) + '", "n": '
+    text = prefix + '-35000000000.0}'
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    assert load_flat_json(str(path)) == _expected(text)
+
+
+@pytest.mark.parametrize('text', ['', '{', '{"a": 1,}', '{"a" 1}', '{"a": 1} 2', '[1, 2'])
+def test_invalid_json_raises(tmp_path, text):
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_flat_json(str(path))
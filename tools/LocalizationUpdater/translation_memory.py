@@ -0,0 +1,176 @@
+import os
+import time
+import logging
+import sqlite3
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Optional, Tuple
+
+from rename_matcher import NGramIndex, MIN_NGRAM_SIMILARITY
+from similarity import similarity_at_least
+
+# Number of n-gram candidates compared with the exact ratio per fuzzy lookup
+MAX_CANDIDATES = 5
+
+
+class TranslationMemory:
+    """
+    English -> Polish pairs for reusing existing translations on new keys.
+
+    Exact matches are a dict lookup. Near matches go through an n-gram
+    inverted index over the English strings, built on the first fuzzy
+    lookup, and only its best candidates are compared with the similarity
+    ratio. Each pair remembers the Polish file it was taken from, and hits
+    from the file being updated are preferred over those of other files.
+    Pairs are kept in SQLite, so translations of keys that were since
+    removed remain available to later runs. Like PretranslationCache,
+    everything is loaded on open and new or changed pairs are written back
+    on close, evicting the least recently seen ones beyond 'max_entries'.
+    """
+
+    DEFAULT_MAX_ENTRIES = 200_000
+
+    def __init__(self, db_path: Optional[str], threshold: float, similarity_backend: str = 'difflib',
+                 min_fuzzy_length: int = 0, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.similarity_backend = similarity_backend
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_entries = max_entries
+
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+
+        # English text -> {Polish file: Polish text}, most recently seen file first
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._new_entries: Dict[Tuple[str, str], str] = {}
+        self._index = None
+        self._connection = None
+
+        if db_path is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(db_path, timeout=30)
+            self._create_table()
+            for source, pl_path, target in self._connection.execute(
+                "SELECT source, pl_path, target FROM translation_memory ORDER BY last_seen DESC"
+            ):
+                self._entries.setdefault(source, {})[pl_path] = target
+        except sqlite3.Error as e:
+            logging.error(f"Translation memory at {db_path} is unavailable: {str(e)}")
+            self._connection = None
+
+    def _create_table(self):
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(translation_memory)")]
+        unscoped = bool(columns) and 'pl_path' not in columns
+        with self._connection:
+            if unscoped:
+                # Pairs stored before files were recorded belong to no file ('')
+                self._connection.execute("ALTER TABLE translation_memory RENAME TO translation_memory_unscoped")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS translation_memory ("
+                " source TEXT NOT NULL,"
+                " pl_path TEXT NOT NULL,"
+                " target TEXT NOT NULL,"
+                " last_seen REAL NOT NULL,"
+                " PRIMARY KEY (source, pl_path))"
+            )
+            if unscoped:
+                self._connection.execute(
+                    "INSERT INTO translation_memory (source, pl_path, target, last_seen)"
+                    " SELECT source, '', target, last_seen FROM translation_memory_unscoped"
+                )
+                self._connection.execute("DROP TABLE translation_memory_unscoped")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS translation_memory_last_seen ON translation_memory (last_seen)"
+            )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_pairs(self, pairs: Iterable[Tuple[str, str]], pl_path: str):
+        """
+        Adds (English, Polish) pairs of the Polish file 'pl_path'; pairs whose
+        Polish text is still the English one are skipped.
+        """
+        for source, target in pairs:
+            if isinstance(source, str) and isinstance(target, str) and source and target and source != target:
+                self._new_entries[source, pl_path] = target
+                targets = self._entries.get(source)
+                if targets is None:
+                    self._entries[source] = {pl_path: target}
+                    self._index = None
+                elif next(iter(targets)) == pl_path:
+                    targets[pl_path] = target
+                else:
+                    targets.pop(pl_path, None)
+                    self._entries[source] = {pl_path: target, **targets}
+
+    def _get_index(self) -> NGramIndex:
+        if self._index is None:
+            self._index = NGramIndex()
+            for source in self._entries:
+                if len(source) >= self.min_fuzzy_length:
+                    self._index.add(source, source)
+        return self._index
+
+    @staticmethod
+    def _pick_file(targets: Dict[str, str], pl_path: str) -> str:
+        return pl_path if pl_path in targets else next(iter(targets))
+
+    def lookup(self, source: str, pl_path: str) -> Optional[Tuple[str, str, float, str]]:
+        """
+        Returns (matched English text, Polish text, similarity ratio, Polish
+        file of the match) for the best entry reaching the threshold, or None.
+        An exact match scores 1.0. Exact matches beat near ones; among matches
+        of the same kind, those from 'pl_path' come first.
+        """
+        targets = self._entries.get(source)
+        if targets is not None:
+            self.exact_hits += 1
+            match_path = self._pick_file(targets, pl_path)
+            return source, targets[match_path], 1.0, match_path
+
+        if len(source) < self.min_fuzzy_length or not self._entries:
+            return None
+
+        best = None
+        for dice, candidate in self._get_index().candidates(source, MAX_CANDIDATES):
+            if dice >= MIN_NGRAM_SIMILARITY and similarity_at_least(candidate, source, self.threshold, self.similarity_backend):
+                if best is None:
+                    best = candidate
+                if pl_path in self._entries[candidate]:
+                    best = candidate
+                    break
+        if best is None:
+            return None
+
+        self.fuzzy_hits += 1
+        match_path = self._pick_file(self._entries[best], pl_path)
+        # The n-gram score only ranks candidates; report the ratio the threshold applies to
+        return best, self._entries[best][match_path], SequenceMatcher(None, best, source).ratio(), match_path
+
+    def close(self):
+        """Writes back the pairs seen in this run, then evicts the least recently seen ones."""
+        if self._connection is None:
+            return
+
+        now = time.time()
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO translation_memory (source, pl_path, target, last_seen) VALUES (?, ?, ?, ?)",
+                    ((source, pl_path, target, now) for (source, pl_path), target in self._new_entries.items())
+                )
+                self._connection.execute(
+                    "DELETE FROM translation_memory WHERE rowid IN ("
+                    " SELECT rowid FROM translation_memory ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update translation memory at {self.db_path}: {str(e)}")
+        finally:
+            self._connection.close()
+            self._connection = None
+            self._new_entries = {}
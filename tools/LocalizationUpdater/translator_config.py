@@ -5,6 +5,7 @@ import datetime
 LOG_DIR = "tools/LocalizationUpdater/Logs"
 CURRENT_TIME = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 LOG_FILENAME = os.path.join(LOG_DIR, f"LocalizationUpdate_{CURRENT_TIME}.log")
+PROFILE_FILENAME = os.path.join(LOG_DIR, f"LocalizationProfile_{CURRENT_TIME}.json")
 
 # --- CORE TRANSLATION PATHS ---
 CORE_EN_DIR = "lang/en/"
@@ -16,6 +17,18 @@ SOURCE_DATA_DIR = "downloaded-source/"
 # --- TEMPORARY & OUTPUT PATHS ---
 TEMP_CORE_EN_DIR = "tools/LocalizationUpdater/OldLocale/"
 
+# --- PRETRANSLATION CACHE ---
+PRETRANSLATION_CACHE_PATH = "tools/LocalizationUpdater/PretranslationCache.sqlite"
+
+# --- TRANSLATION MEMORY ---
+TRANSLATION_MEMORY_PATH = "tools/LocalizationUpdater/TranslationMemory.sqlite"
+
+# --- ENGLISH SOURCE HISTORY ---
+ENGLISH_HISTORY_PATH = "tools/LocalizationUpdater/EnglishHistory.sqlite"
+
+# --- INCREMENTAL UPDATE MANIFEST ---
+UPDATE_MANIFEST_PATH = "tools/LocalizationUpdater/UpdateManifest.json"
+
 # --- CORE FILE MAPPINGS & LISTS ---
 CORE_FILE_PAIRS = [
     ("en", "pl"),
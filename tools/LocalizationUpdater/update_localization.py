@@ -5,9 +5,18 @@ import shutil
 import argparse
 from colorama import Fore, Style, init as colorama_init
 from localization_updater import LocalizationUpdater
+from similarity import SIMILARITY_BACKENDS
+from json_backend import JSON_BACKENDS
+from parallel_processing import process_pairs_in_parallel
+from instrumentation import write_profile_report
+from update_manifest import UpdateManifest
+from xliff_bridge import process_xliff
+from locale_snapshot import SNAPSHOT_MODES, snapshot_directory
+from json_writer import write_if_changed
 from translator_config import (
     LOG_DIR, LOG_FILENAME, TEMP_CORE_EN_DIR, CORE_EN_DIR, CORE_PL_DIR, 
-    CORE_FILE_PAIRS, COMPLETED_FILES, SOURCE_DATA_DIR
+    CORE_FILE_PAIRS, COMPLETED_FILES, SOURCE_DATA_DIR, PRETRANSLATION_CACHE_PATH,
+    PROFILE_FILENAME, UPDATE_MANIFEST_PATH, TRANSLATION_MEMORY_PATH, ENGLISH_HISTORY_PATH
 )
 
 
@@ -38,27 +47,6 @@ def _merge_directories(src, dst):
         else:
             shutil.copy2(src_path, dst_path)
 
-def _copy_files_and_directories(src_directory, dst_directory):
-    """
-    Recursively copy all files and directories from the source directory 
-    to the destination directory. Existing files in the destination directory 
-    with the same name will be overwritten.
-    """
-    if os.path.exists(dst_directory):
-        shutil.rmtree(dst_directory)
-    os.makedirs(dst_directory)
-
-    for item in os.listdir(src_directory):
-        src_path = os.path.join(src_directory, item)
-        dst_path = os.path.join(dst_directory, item)
-        if os.path.isdir(src_path):
-            if os.path.exists(dst_path):
-                _copy_files_and_directories(src_path, dst_path)
-            else:
-                shutil.copytree(src_path, dst_path)
-        else:
-            shutil.copy2(src_path, dst_path)
-
 def _update_source_data():
     """Updates source data from downloaded-source directory."""
     print("\nUpdating source data from downloaded-source directory...")
@@ -73,16 +61,17 @@ def _update_source_data():
         print(f"{Fore.RED}Error: Source file {source_en} not found.{Style.RESET_ALL}")
         return False
     
-    # Copy downloaded source to lang/en/
+    # Copy downloaded source to lang/en/, replacing the file so a hardlinked snapshot keeps the old one
     dest_en = os.path.join(CORE_EN_DIR, "en.json")
-    os.makedirs(os.path.dirname(dest_en), exist_ok=True)
-    shutil.copy2(source_en, dest_en)
+    with open(source_en, 'rb') as f:
+        write_if_changed(dest_en, f.read())
     print(f"Updated {dest_en} from downloaded source")
     
     return True
 
-def _process_core_translations(file_pairs, perform_regex_translate, verbose_flag):
+def _process_core_translations(file_pairs, perform_regex_translate, verbose_flag, cache_path=None, similarity_backend='difflib', jobs=1, pretranslation_workers=1, profile=False, manifest=None, translation_memory_path=TRANSLATION_MEMORY_PATH, use_translation_memory=True, json_backend='auto', english_history_path=ENGLISH_HISTORY_PATH):
     core_logger = SectionalLogger("\nProcessing core system translations...", "\n=== Core Translations ===")
+    tasks = []
     
     for en_name, pl_name in file_pairs:
         en_old_path = os.path.join(TEMP_CORE_EN_DIR, en_name + ".json")
@@ -95,6 +84,12 @@ def _process_core_translations(file_pairs, perform_regex_translate, verbose_flag
             print(f"       Run 'npm run download' to fetch source files.{Style.RESET_ALL}")
             continue
 
+        # In incremental mode, skip pairs that are byte-identical to what the last run wrote
+        if manifest is not None and not perform_regex_translate and manifest.is_pair_unchanged(pl_path, en_path, pl_path):
+            if verbose_flag:
+                print(f"Skipping unchanged files: {en_path}, {pl_path}")
+            continue
+
         # Check if the Polish file exists
         if not os.path.exists(pl_path):
             if verbose_flag:
@@ -115,9 +110,44 @@ def _process_core_translations(file_pairs, perform_regex_translate, verbose_flag
             with open(en_old_path, 'w', encoding='utf-8') as f:
                 f.write("{}")
         
-        log_identifier = f"core/{os.path.basename(pl_path)}"
-        updater = LocalizationUpdater(en_old_path, en_path, pl_path, effective_verbose, log_identifier, logger=core_logger)
-        updater.process(perform_regex_translate)
+        tasks.append({
+            'en_old_path': en_old_path,
+            'en_path': en_path,
+            'pl_path': pl_path,
+            'verbose': effective_verbose,
+            'log_identifier': f"core/{os.path.basename(pl_path)}",
+            'cache_path': cache_path,
+            'similarity_backend': similarity_backend,
+            'pretranslation_workers': pretranslation_workers,
+            'profile': profile,
+            'previous_state': manifest.get(pl_path) if manifest is not None else None,
+            'translation_memory_path': translation_memory_path,
+            'use_translation_memory': use_translation_memory,
+            'json_backend': json_backend,
+            'english_history_path': english_history_path,
+        })
+
+    if jobs > 1 and len(tasks) > 1:
+        results = process_pairs_in_parallel(tasks, perform_regex_translate, jobs, logger=core_logger)
+    else:
+        results = []
+        for updater_args in tasks:
+            updater = LocalizationUpdater(**updater_args, logger=core_logger)
+            updater.process(perform_regex_translate)
+            results.append((updater.profiler.to_dict() if updater.profiler else None, updater.saved_state))
+
+    if manifest is not None:
+        for task, (_, saved_state) in zip(tasks, results):
+            if saved_state is not None:
+                manifest.set(task['pl_path'], saved_state)
+        manifest.save()
+
+    # Profiling reports per file, keyed by log identifier
+    return {
+        task['log_identifier']: report
+        for task, (report, _) in zip(tasks, results)
+        if report is not None
+    }
 
 
 def main():
@@ -128,16 +158,33 @@ def main():
     parser = argparse.ArgumentParser(description='Run the localization update script.')
     parser.add_argument('--UpdateSourceData', action='store_true', help='Update source data from downloaded-source directory.')
     parser.add_argument('--PerformRegexTranslate', action='store_true', help='Forces re-processing all strings by regex translations.')
+    parser.add_argument('--NoPretranslationCache', action='store_true', help='Disable the on-disk cache of regex pretranslation results.')
+    parser.add_argument('--SimilarityBackend', choices=SIMILARITY_BACKENDS, default='difflib', help='Similarity implementation used to detect rudimentary translations.')
+    parser.add_argument('--JsonBackend', choices=JSON_BACKENDS, default='auto', help='JSON parser/serializer for language files (auto = fastest installed; output is identical).')
+    parser.add_argument('-j', '--Jobs', type=int, default=1, help='Number of worker processes used to process file pairs in parallel (0 = one per CPU core).')
+    parser.add_argument('--PretranslationWorkers', type=int, default=1, help='Number of worker processes used to pretranslate chunks of a single large file (0 = one per CPU core).')
+    parser.add_argument('--Profile', action='store_true', help=f'Write per-stage timings and pattern statistics as JSON next to the log file ({PROFILE_FILENAME}).')
+    parser.add_argument('--Incremental', action='store_true', help='Skip file pairs and subtrees that did not change since the last run (tracked in the update manifest).')
+    parser.add_argument('--NoTranslationMemory', action='store_true', help='Do not translate new keys from existing translations; always use regex pretranslation.')
+    parser.add_argument('--NoEnglishHistory', action='store_true', help='Do not record English versions or compare against the version each Polish file was last updated from.')
+    parser.add_argument('--SnapshotMode', choices=SNAPSHOT_MODES, default='auto', help='How the old English files are kept for comparison (auto = copy-on-write clone, else hardlink, else full copy).')
+    parser.add_argument('--Xliff', default=None, help='Update this XLIFF file directly from the core English file instead of the Polish JSON files.')
     parser.add_argument('-v', '--Verbose', action='store_true', help='Enable verbose logging.')
     args = parser.parse_args()
 
     update_source_data = args.UpdateSourceData
     perform_regex_translate = args.PerformRegexTranslate
     verbose = args.Verbose
+    cache_path = None if args.NoPretranslationCache else PRETRANSLATION_CACHE_PATH
+    jobs = args.Jobs if args.Jobs > 0 else os.cpu_count()
+    manifest = UpdateManifest(UPDATE_MANIFEST_PATH) if args.Incremental else None
+    pretranslation_workers = args.PretranslationWorkers if args.PretranslationWorkers > 0 else os.cpu_count()
 
     # Backup the old localization source for comparison before any processing
     print("\nBacking up current core English translations for comparison...")
-    _copy_files_and_directories(CORE_EN_DIR, TEMP_CORE_EN_DIR)
+    snapshot_counts = snapshot_directory(CORE_EN_DIR, TEMP_CORE_EN_DIR, args.SnapshotMode)
+    if verbose:
+        print(", ".join(f"{method}: {count}" for method, count in snapshot_counts.items() if count) or "No files to back up")
 
     # Update the source files if requested
     if update_source_data:
@@ -145,7 +192,21 @@ def main():
             print(f"{Fore.YELLOW}Continuing with existing source files...{Style.RESET_ALL}")
 
     # Process core translations
-    _process_core_translations(CORE_FILE_PAIRS, perform_regex_translate, verbose)
+    if args.Xliff:
+        xliff_logger = SectionalLogger("\nProcessing XLIFF translations...", "\n=== XLIFF Translations ===")
+        updater = process_xliff(os.path.join(CORE_EN_DIR, "en.json"), args.Xliff, perform_regex_translate, verbose, logger=xliff_logger,
+                                cache_path=cache_path, similarity_backend=args.SimilarityBackend,
+                                pretranslation_workers=pretranslation_workers, profile=args.Profile,
+                                translation_memory_path=TRANSLATION_MEMORY_PATH, use_translation_memory=not args.NoTranslationMemory,
+                                json_backend=args.JsonBackend)
+        profile_reports = {updater.log_identifier: updater.profiler.to_dict()} if updater.profiler else {}
+    else:
+        profile_reports = _process_core_translations(CORE_FILE_PAIRS, perform_regex_translate, verbose, cache_path, args.SimilarityBackend, jobs, pretranslation_workers, args.Profile, manifest,
+                                                     TRANSLATION_MEMORY_PATH, not args.NoTranslationMemory, args.JsonBackend,
+                                                     None if args.NoEnglishHistory else ENGLISH_HISTORY_PATH)
+
+    if args.Profile:
+        write_profile_report(PROFILE_FILENAME, profile_reports)
         
     # Remove old localization source after processing
     if os.path.exists(TEMP_CORE_EN_DIR):
@@ -154,6 +215,8 @@ def main():
     
     print(f"\n{Fore.GREEN}✓ Localization update completed!{Style.RESET_ALL}")
     print(f"Check the log file at: {LOG_FILENAME}")
+    if args.Profile:
+        print(f"Profiling report saved to: {PROFILE_FILENAME}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Optional
+
+
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of the raw file content, or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def subtree_hashes(nested) -> Dict[str, str]:
+    """Hashes each top-level subtree of a nested language file."""
+    if not isinstance(nested, dict):
+        return {}
+    return {
+        key: hashlib.sha1(json.dumps(value, ensure_ascii=False).encode('utf-8')).hexdigest()
+        for key, value in nested.items()
+    }
+
+
+class UpdateManifest:
+    """
+    Content hashes of every processed file pair, as saved by the last run.
+
+    Each entry is keyed by the Polish file path and holds the file hashes
+    of the English and Polish files and the hashes of their top-level
+    subtrees, as written by LocalizationUpdater.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logging.error(f"Could not read update manifest {path}, starting from scratch: {str(e)}")
+                self.entries = {}
+
+    def get(self, pair_id: str) -> dict:
+        return self.entries.get(pair_id, {})
+
+    def set(self, pair_id: str, entry: dict):
+        self.entries[pair_id] = entry
+
+    def is_pair_unchanged(self, pair_id: str, en_path: str, pl_path: str) -> bool:
+        """True if both files are byte-identical to what the last run wrote."""
+        entry = self.entries.get(pair_id)
+        if not entry:
+            return False
+        return entry.get('en') == file_hash(en_path) and entry.get('pl') == file_hash(pl_path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=4, ensure_ascii=False)
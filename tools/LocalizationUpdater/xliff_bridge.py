@@ -0,0 +1,146 @@
+import os
+import logging
+import importlib.util
+
+from localization_updater import LocalizationUpdater
+from instrumentation import profiler_stage
+
+XLIFF_TOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'xliff-tool.py')
+
+# XLIFF <target state="..."> written for each kind of change found by the updater
+XLIFF_STATES = {
+    'new': 'new',
+    'memory': 'translated',
+    'updated_eng': 'needs-translation',
+    'rudimentary': 'translated',
+    'outdated': 'needs-review-translation',
+    'review_needed': 'needs-review-translation',
+}
+
+_xliff_tool = None
+
+
+def load_xliff_tool():
+    """Imports tools/xliff-tool.py, whose file name is not a valid module name."""
+    global _xliff_tool
+    if _xliff_tool is None:
+        spec = importlib.util.spec_from_file_location('xliff_tool', XLIFF_TOOL_PATH)
+        _xliff_tool = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_xliff_tool)
+    return _xliff_tool
+
+
+class XliffLocalizationUpdater(LocalizationUpdater):
+    """
+    Runs the LocalizationUpdater logic directly against an XLIFF file.
+
+    The XLIFF sources act as the old English file and its targets as the
+    Polish file (an empty target counts as text kept in English). Results
+    are written back as unit changes with XLIFF states instead of
+    rebuilding JSON, so a cycle is one XLIFF parse and one XLIFF write.
+    Keys use xliff-tool's flat key format, so ids match its export-to and
+    update-from commands.
+    """
+
+    def __init__(self, en_path: str, xliff_path: str, verbose: bool, log_identifier: str, logger=None, target_language: str = 'pl', **kwargs):
+        super().__init__('', en_path, xliff_path, verbose, log_identifier, logger=logger, **kwargs)
+        self.xliff_path = xliff_path
+        self.target_language = target_language
+        self.xliff_file = None
+        # Polish values as read, to write back only the targets the updater changed
+        self.loaded_pl = {}
+
+    def _load_and_validate_files(self):
+        xliff_tool = load_xliff_tool()
+        en_data = self._get_file_from_directory(self.en_path)
+        if en_data is None:
+            logging.info(f"{self.log_identifier}:")
+            logging.error("Unable to proceed due to missing 'en' data.")
+            return False
+
+        try:
+            with profiler_stage(self.profiler, 'load_xliff'):
+                if os.path.exists(self.xliff_path):
+                    self.xliff_file = xliff_tool.XliffFile.read(self.xliff_path)
+                else:
+                    self.xliff_file = xliff_tool.XliffFile.create(self.xliff_path, 'en', self.target_language)
+        except Exception as e:
+            logging.error(f"An error occurred while loading the XLIFF file: {self.xliff_path}: {str(e)}")
+            return False
+
+        with profiler_stage(self.profiler, 'flatten'):
+            self.en_extracted = xliff_tool.flattened_json(en_data, True)
+
+        self.en_old_extracted = {}
+        self.pl_extracted = {}
+        for unit in self.xliff_file.translation_units():
+            if unit.id in self.en_old_extracted:
+                continue
+            self.en_old_extracted[unit.id] = unit.source
+            self.pl_extracted[unit.id] = unit.target or unit.source
+        self.loaded_pl = dict(self.pl_extracted)
+        return True
+
+    def _sort_and_save_translations(self):
+        """Writes the results back into the XLIFF units and saves the file once."""
+        xliff_file = self.xliff_file
+        states = {}
+        for key in self.new_keys:
+            states[key] = XLIFF_STATES['new']
+        for key, _, _, _ in self.memory_translated_keys:
+            states[key] = XLIFF_STATES['memory']
+        for key in self.updated_eng_keys:
+            states[key] = XLIFF_STATES['updated_eng']
+        for key in self.rudimentary_translations_updated:
+            states[key] = XLIFF_STATES['rudimentary']
+        for key in self.review_needed_keys:
+            states[key] = XLIFF_STATES['review_needed']
+        outdated_keys = {key for key, _ in self.outdated_keys}
+        for key in outdated_keys:
+            states[key] = XLIFF_STATES['outdated']
+
+        for old_key, new_key in self.renamed_keys + self.fuzzy_renamed_keys:
+            unit = xliff_file.find_translation_unit(old_key)
+            if unit is not None and xliff_file.find_translation_unit(new_key) is None:
+                xliff_file.rename_translation_unit(unit, new_key)
+                self.loaded_pl[new_key] = self.loaded_pl.pop(old_key, None)
+
+        # Drop units whose keys are no longer in the English file, like the Polish JSON does
+        xliff_tool = load_xliff_tool()
+        for key in [key for key in xliff_file.units_by_id if key not in self.en_extracted]:
+            for xml_unit in list(xliff_file.units_by_id[key]):
+                xliff_file.remove_translation_unit(xliff_tool.XliffTranslationUnit(xliff_file, xml_unit))
+
+        for key, en_value in self.en_extracted.items():
+            pl_value = self.pl_extracted.get(key)
+            unit = xliff_file.find_translation_unit(key)
+            if unit is None:
+                unit = xliff_file.create_translation_unit(key, en_value)
+            elif unit.source != en_value:
+                if key in outdated_keys:
+                    unit.create_note(f'Old source text:\n{unit.source}')
+                unit.source = en_value
+
+            if pl_value is not None and pl_value != self.loaded_pl.get(key):
+                unit.target = pl_value
+
+            state = states.get(key)
+            if state is not None:
+                unit.state = state
+                unit.approve(False)
+
+        xliff_file.order_translation_units(self.en_extracted.keys())
+        self.pl_extracted = {key: self.pl_extracted.get(key, None) for key in self.en_extracted.keys()}
+
+        try:
+            with profiler_stage(self.profiler, 'save_xliff'):
+                xliff_file.write()
+        except Exception as e:
+            logging.error(f"An error occurred while saving the XLIFF file to {self.xliff_path}: {str(e)}")
+
+
+def process_xliff(en_path: str, xliff_path: str, perform_regex_translate: bool, verbose: bool, logger=None, **kwargs) -> XliffLocalizationUpdater:
+    """Updates 'xliff_path' from the English file 'en_path' in a single pass."""
+    updater = XliffLocalizationUpdater(en_path, xliff_path, verbose, f"xliff/{os.path.basename(xliff_path)}", logger=logger, **kwargs)
+    updater.process(perform_regex_translate)
+    return updater
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LocalizationUpdater'))
+
+from flat_keys import flatten_localization, rebuild_nested
+
+DEFAULT_SOURCE = "lang/en/en.json"
+# Budget for flattening plus rebuilding a ~250KB language file
+DEFAULT_BUDGET_MS = 25.0
+
+
+def best_of(function, argument, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Guard the flatten/rebuild time of a language file.')
+    parser.add_argument('--Source', default=DEFAULT_SOURCE, help='Nested language JSON file to measure.')
+    parser.add_argument('--BudgetMs', type=float, default=DEFAULT_BUDGET_MS, help='Maximum allowed flatten + rebuild time in milliseconds.')
+    parser.add_argument('--Repeats', type=int, default=20, help='Number of runs; the best one is reported.')
+    args = parser.parse_args()
+
+    with open(args.Source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    flat = flatten_localization(data)
+    if rebuild_nested(flat) != data:
+        print(f"Round trip of {args.Source} does not reproduce the original structure.")
+        sys.exit(1)
+
+    flatten_ms = best_of(flatten_localization, data, args.Repeats)
+    rebuild_ms = best_of(rebuild_nested, flat, args.Repeats)
+    total_ms = flatten_ms + rebuild_ms
+
+    print(f"{args.Source}: {len(flat)} keys")
+    print(f"  flatten: {flatten_ms:.2f} ms")
+    print(f"  rebuild: {rebuild_ms:.2f} ms")
+    print(f"  total:   {total_ms:.2f} ms (budget {args.BudgetMs:.2f} ms)")
+
+    if total_ms > args.BudgetMs:
+        print("Flatten/rebuild budget exceeded.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
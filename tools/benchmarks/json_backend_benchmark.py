@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LocalizationUpdater'))
+
+from json_backend import JSON_BACKENDS, is_json_backend_available, load_json, dumps_json
+from synthetic_corpus import generate_corpus, nest
+
+REPO_EN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lang', 'en', 'en.json')
+# Rough size of one generated key in the written file, used to reach --SizeMb
+BYTES_PER_KEY = 120
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def write_synthetic_file(directory, size_mb):
+    _, en, _ = generate_corpus(max(size_mb * 1024 * 1024 // BYTES_PER_KEY, 1))
+    path = os.path.join(directory, 'synthetic_en.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(nest(en), f, ensure_ascii=False, indent=4)
+    return path
+
+
+def run_file(path, backends, repeats):
+    data = load_json(path, 'stdlib')
+    expected = dumps_json(data, 4, 'stdlib')
+
+    results = {}
+    for backend in backends:
+        if dumps_json(data, 4, backend) != expected or load_json(path, backend) != data:
+            print(f"  {backend}: output differs from stdlib, skipped")
+            continue
+        results[backend] = (
+            best_of(lambda: load_json(path, backend), repeats),
+            best_of(lambda: dumps_json(data, 4, backend), repeats),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare load and dump times of the JSON backends on en.json and a large synthetic file.')
+    parser.add_argument('--SizeMb', type=int, default=50, help='Approximate size of the synthetic file in megabytes.')
+    parser.add_argument('--Repeats', type=int, default=3, help='Number of runs per step; the best one is reported.')
+    args = parser.parse_args()
+
+    backends = [backend for backend in JSON_BACKENDS if backend != 'auto' and is_json_backend_available(backend)]
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [REPO_EN_PATH] if os.path.exists(REPO_EN_PATH) else []
+        paths.append(write_synthetic_file(directory, args.SizeMb))
+
+        for path in paths:
+            print(f"{os.path.basename(path)} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+            results = run_file(path, backends, args.Repeats)
+            for backend, (load_ms, dump_ms) in results.items():
+                print(f"  {backend:<8} load {load_ms:>10.2f} ms   dump {dump_ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
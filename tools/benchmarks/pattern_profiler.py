@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LocalizationUpdater'))
+
+import regex
+from auto_translation_regex import PATTERN_MAPPING
+from localization_updater import LocalizationUpdater
+
+DEFAULT_CORPUS = ["lang/en/en.json"]
+# A pattern is reported as slow when its time per input character exceeds
+# the median of all patterns by this factor.
+SLOW_FACTOR = 10.0
+
+
+def load_regex_lib(path):
+    """
+    Reads rules in the tools/regexLib.txt format: blank-line separated blocks of
+    a title line, a pattern line and a replacement line using $1-style group
+    references. Blocks without a replacement line, such as the '// ' sections
+    of search-only patterns, are skipped rather than treated as deletions.
+    """
+    rules = []
+    with open(path, 'r', encoding='utf-8') as f:
+        blocks = f.read().split('\n\n')
+
+    for block in blocks:
+        lines = [line for line in block.split('\n') if line.strip()]
+        if len(lines) < 3:
+            continue
+        title, pattern = lines[0].strip(), lines[1]
+        replacement = regex.sub(r'\$(\d+)', r'\\g<\1>', lines[2])
+        rules.append((f"{os.path.basename(path)}: {title.strip('/ :')}", pattern, replacement))
+    return rules
+
+
+def load_corpus(paths):
+    """Flattens the given language files and returns their string values, brackets masked as in _auto_pretranslate."""
+    updater = LocalizationUpdater('', '', '', False, 'pattern_profiler')
+    texts = []
+    for path in paths:
+        flat = updater._extract_localization_dict(updater._get_file_from_directory(path)) or {}
+        texts.extend(
+            updater.bracket_pattern.sub('__PLACEHOLDER_0__', value)
+            for value in flat.values() if isinstance(value, str)
+        )
+    return texts
+
+
+def profile_rules(rules, texts, timeout):
+    """
+    Runs every rule over the whole corpus, in order, feeding each rule the
+    output of the previous one like the updater does.
+    """
+    total_chars = sum(len(text) for text in texts) or 1
+    results = []
+
+    for label, pattern, replacement in rules:
+        compiled = regex.compile(pattern)
+        stats = {
+            "label": label,
+            "pattern": pattern,
+            "matches": 0,
+            "strings_matched": 0,
+            "identity_strings": 0,
+            "seconds": 0.0,
+            "worst_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+        output = []
+        for text in texts:
+            start = time.perf_counter()
+            try:
+                new_text, hits = compiled.subn(replacement, text, timeout=timeout)
+            except TimeoutError:
+                new_text, hits = text, 0
+                stats["timeouts"] += 1
+            elapsed = time.perf_counter() - start
+
+            stats["seconds"] += elapsed
+            stats["worst_seconds"] = max(stats["worst_seconds"], elapsed)
+            if hits:
+                stats["matches"] += hits
+                stats["strings_matched"] += 1
+                if new_text == text:
+                    stats["identity_strings"] += 1
+            output.append(new_text)
+
+        texts = output
+        stats["noop_rate"] = 1.0 - (stats["strings_matched"] - stats["identity_strings"]) / (len(texts) or 1)
+        stats["microseconds_per_kchar"] = stats["seconds"] * 1e9 / total_chars
+        results.append(stats)
+
+    median_cost = statistics.median(stats["microseconds_per_kchar"] for stats in results) if results else 0.0
+    for stats in results:
+        flags = []
+        if stats["matches"] == 0:
+            flags.append("never-matches")
+        elif stats["identity_strings"] == stats["strings_matched"]:
+            flags.append("identity-replacement")
+        if stats["timeouts"]:
+            flags.append("timeout")
+        if median_cost and stats["microseconds_per_kchar"] > median_cost * SLOW_FACTOR:
+            flags.append("slow")
+        stats["flags"] = flags
+
+    return results
+
+
+def print_report(results, corpus_size):
+    print(f"Corpus: {corpus_size} strings\n")
+    print(f"{'seconds':>9} {'worst ms':>9} {'matches':>8} {'no-op %':>8}  {'flags':<28} rule")
+    for stats in sorted(results, key=lambda item: item["seconds"], reverse=True):
+        print(f"{stats['seconds']:>9.4f} {stats['worst_seconds'] * 1000:>9.3f} {stats['matches']:>8} "
+              f"{stats['noop_rate'] * 100:>8.2f}  {','.join(stats['flags']):<28} {stats['label']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cost and usefulness of every auto-translation regex rule.')
+    parser.add_argument('--Corpus', nargs='+', default=DEFAULT_CORPUS, help='Language JSON files whose values are used as input.')
+    parser.add_argument('--PatternSet', default=None, help='Only profile this PATTERN_MAPPING entry (default: all of them).')
+    parser.add_argument('--RegexLib', nargs='*', default=[], help='Also profile rules from files in the tools/regexLib.txt format.')
+    parser.add_argument('--Timeout', type=float, default=1.0, help='Per-string timeout in seconds, to catch catastrophic backtracking.')
+    parser.add_argument('--Output', default=None, help='Write the full report as JSON to this file.')
+    args = parser.parse_args()
+
+    rule_sets = {}
+    for name, patterns in PATTERN_MAPPING.items():
+        if args.PatternSet is None or str(name) == args.PatternSet:
+            rule_sets[str(name)] = [(pattern, pattern, replacement) for pattern, replacement in patterns]
+    for path in args.RegexLib:
+        rule_sets[path] = load_regex_lib(path)
+
+    texts = load_corpus(args.Corpus)
+    report = {}
+    for name, rules in rule_sets.items():
+        print(f"\n=== {name} ===")
+        results = profile_rules(rules, texts, args.Timeout)
+        print_report(results, len(texts))
+        report[name] = results
+
+    if args.Output:
+        with open(args.Output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"\nReport saved to {args.Output}")
+
+
+if __name__ == "__main__":
+    main()
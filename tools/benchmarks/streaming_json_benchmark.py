@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LocalizationUpdater'))
+
+from flat_keys import flatten_localization
+from streaming_json import load_flat_json
+from synthetic_corpus import generate_corpus, nest
+from json_backend_benchmark import BYTES_PER_KEY
+
+
+def load_nested(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return flatten_localization(json.load(f))
+
+
+def measure(function, path):
+    """Returns (result, seconds, peak traced MB) of one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(path)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare json.load + flatten with the streaming flat reader on a large synthetic file.')
+    parser.add_argument('--SizeMb', type=int, default=200, help='Approximate size of the synthetic file in megabytes.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic_en.json')
+        _, en, _ = generate_corpus(max(args.SizeMb * 1024 * 1024 // BYTES_PER_KEY, 1))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(nest(en), f, ensure_ascii=False, indent=4)
+        del en
+        print(f"{os.path.basename(path)} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+        expected, seconds, peak = measure(load_nested, path)
+        print(f"  {'json.load + flatten':<20} {seconds * 1000:>10.2f} ms   peak {peak:>8.1f} MB")
+        result, seconds, peak = measure(load_flat_json, path)
+        print(f"  {'streaming':<20} {seconds * 1000:>10.2f} ms   peak {peak:>8.1f} MB")
+        if list(result.items()) != list(expected.items()):
+            print("  streaming result differs from json.load + flatten")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
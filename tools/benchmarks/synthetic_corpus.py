@@ -0,0 +1,114 @@
+import os
+import json
+import random
+from typing import Dict, Tuple
+
+WORDS = [
+    "Actor", "Item", "Scene", "Token", "Settings", "Combat", "Roll", "Dice", "Journal", "Macro",
+    "create", "delete", "update", "the", "a", "of", "to", "with", "for", "your", "each", "target",
+    "damage", "spell", "level", "check", "save", "attack", "bonus", "effect", "duration", "round",
+    "hidden", "visible", "player", "owner", "select", "toggle", "enable", "disable", "world", "folder",
+]
+
+POLISH_WORDS = [
+    "Aktor", "Przedmiot", "Scena", "Token", "Ustawienia", "Walka", "Rzut", "Kości", "Dziennik", "Makro",
+    "utwórz", "usuń", "aktualizuj", "ten", "jeden", "z", "do", "ze", "dla", "twój", "każdy", "cel",
+    "obrażenia", "zaklęcie", "poziom", "test", "rzut obronny", "atak", "premia", "efekt", "czas", "runda",
+]
+
+NAMESPACES = ["CORE", "SETTINGS", "DOCUMENT", "CONTROLS", "COMBAT", "SIDEBAR", "CHAT", "TOKEN", "ITEM", "ACTOR"]
+
+
+def _sentence(rng: random.Random, words, min_words=2, max_words=14) -> str:
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(min_words, max_words)))
+    return text[0].upper() + text[1:]
+
+
+def _with_markup(rng: random.Random, text: str) -> str:
+    uuid = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(16))
+    reference = f"@UUID[Compendium.pf2e.spells-srd.Item.{uuid}]{{{rng.choice(WORDS)}}}"
+    roll = f"[[/r {rng.randint(1, 4)}d{rng.choice([4, 6, 8, 10, 12])}]]"
+    return f"<p>{text} {reference} {roll}</p>\n<p>{_sentence(rng, WORDS)}</p>"
+
+
+def _value(rng: random.Random, markup_fraction: float) -> str:
+    text = _sentence(rng, WORDS)
+    if rng.random() < markup_fraction:
+        text = _with_markup(rng, text)
+    return text
+
+
+def _translate(rng: random.Random, text: str, untranslated_fraction: float) -> str:
+    if rng.random() < untranslated_fraction:
+        return text
+    return " ".join(rng.choice(POLISH_WORDS) if word.isalpha() else word for word in text.split(" "))
+
+
+def _flat_key(index: int) -> str:
+    namespace = NAMESPACES[index % len(NAMESPACES)]
+    group = f"Group{(index // len(NAMESPACES)) % 97}"
+    return f"{namespace}.{group}.Key{index}"
+
+
+def nest(flat: Dict[str, str]) -> dict:
+    """Nests dotted flat keys into Foundry's language file shape."""
+    nested = {}
+    for key, value in flat.items():
+        current = nested
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            current = current.setdefault(parent, {})
+        current[leaf] = value
+    return nested
+
+
+def generate_corpus(num_keys: int, renamed_fraction: float = 0.01, changed_fraction: float = 0.02,
+                    removed_fraction: float = 0.01, markup_fraction: float = 0.2,
+                    untranslated_fraction: float = 0.1, seed: int = 0) -> Tuple[dict, dict, dict]:
+    """
+    Generates nested (en_old, en, pl) language files.
+
+    'en' has exactly 'num_keys' keys. Relative to 'en_old', the given
+    fractions of keys are renamed (same value, new key), changed (new
+    value) or removed, and an equal number of keys is added. 'pl' is a
+    translation of 'en_old', with 'untranslated_fraction' of its values
+    left in English. 'markup_fraction' of the values carry HTML,
+    @UUID[...] references and inline rolls.
+    """
+    rng = random.Random(seed)
+
+    removed_count = int(num_keys * removed_fraction)
+    old_count = num_keys
+    en_old = {_flat_key(index): _value(rng, markup_fraction) for index in range(old_count)}
+    pl = {key: _translate(rng, value, untranslated_fraction) for key, value in en_old.items()}
+
+    old_keys = list(en_old)
+    rng.shuffle(old_keys)
+    renamed = old_keys[:int(num_keys * renamed_fraction)]
+    changed = old_keys[len(renamed):len(renamed) + int(num_keys * changed_fraction)]
+    removed = set(old_keys[len(renamed) + len(changed):len(renamed) + len(changed) + removed_count])
+    renamed_to = {key: f"{key}Renamed" for key in renamed}
+
+    en = {}
+    changed = set(changed)
+    for key, value in en_old.items():
+        if key in removed:
+            continue
+        if key in changed:
+            value = f"{value} {_sentence(rng, WORDS, 1, 3)}"
+        en[renamed_to.get(key, key)] = value
+
+    for index in range(old_count, old_count + removed_count):
+        en[_flat_key(index)] = _value(rng, markup_fraction)
+
+    return nest(en_old), nest(en), nest(pl)
+
+
+def write_corpus(directory: str, num_keys: int, **options) -> Tuple[str, str, str]:
+    """Writes a generated corpus to 'directory' and returns the en_old, en and pl paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = tuple(os.path.join(directory, name) for name in ("en_old.json", "en.json", "pl.json"))
+    for path, data in zip(paths, generate_corpus(num_keys, **options)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+    return paths
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LocalizationUpdater'))
+
+from localization_updater import LocalizationUpdater
+from synthetic_corpus import write_corpus
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "updater_benchmark.json")
+STAGES = ["load", "flatten", "compile_patterns", "value_mappings", "process_translations",
+          "remove_obsolete", "rebuild", "save"]
+
+
+class StageRecorder:
+    """Collects wall time and, optionally, peak traced memory per stage."""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+
+        result = self.results.setdefault(name, {})
+        if self.trace_memory:
+            result["peak_mb"] = (tracemalloc.get_traced_memory()[1] - start_memory) / (1024 * 1024)
+        else:
+            result["seconds"] = elapsed
+
+
+def run_pipeline(paths, output_dir, perform_regex_translate, recorder):
+    """Runs the stages of LocalizationUpdater.process one by one under 'recorder'."""
+    en_old_path, en_path, pl_path = paths
+    updater = LocalizationUpdater(en_old_path, en_path, pl_path, False, "benchmark")
+    updater.perform_regex_translate = perform_regex_translate
+
+    with recorder.stage("load"):
+        raw = [updater._get_file_from_directory(path) for path in paths]
+    with recorder.stage("flatten"):
+        updater.en_old_extracted, updater.en_extracted, updater.pl_extracted = (
+            updater._extract_localization_dict(data) for data in raw
+        )
+    del raw
+    with recorder.stage("compile_patterns"):
+        updater._compile_patterns()
+    with recorder.stage("value_mappings"):
+        value_mappings = updater._calculate_value_mappings()
+    with recorder.stage("process_translations"):
+        updater._process_translations(value_mappings)
+    with recorder.stage("remove_obsolete"):
+        updater._remove_obsolete_keys(set(updater.en_old_extracted), set(updater.en_extracted))
+    with recorder.stage("rebuild"):
+        ordered_pl = {key: updater.pl_extracted.get(key, None) for key in updater.en_extracted}
+        nested_pl = updater._rebuild_nested_json(ordered_pl)
+        nested_en = updater._rebuild_nested_json(updater.en_extracted)
+    with recorder.stage("save"):
+        updater._save_file_to_directory(os.path.join(output_dir, "pl.json"), nested_pl)
+        updater._save_file_to_directory(os.path.join(output_dir, "en.json"), nested_en)
+
+
+def benchmark_size(num_keys, corpus_options, perform_regex_translate, measure_memory):
+    work_dir = tempfile.mkdtemp(prefix=f"updater_benchmark_{num_keys}_")
+    try:
+        paths = write_corpus(os.path.join(work_dir, "input"), num_keys, **corpus_options)
+        output_dir = os.path.join(work_dir, "output")
+
+        timing = StageRecorder(trace_memory=False)
+        run_pipeline(paths, output_dir, perform_regex_translate, timing)
+        results = timing.results
+
+        if measure_memory:
+            memory = StageRecorder(trace_memory=True)
+            tracemalloc.start()
+            try:
+                run_pipeline(paths, output_dir, perform_regex_translate, memory)
+            finally:
+                tracemalloc.stop()
+            for stage, values in memory.results.items():
+                results[stage].update(values)
+
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_results(num_keys, results):
+    print(f"\n{num_keys} keys:")
+    print(f"  {'stage':<22}{'seconds':>10}{'peak MB':>10}")
+    for stage in STAGES:
+        values = results[stage]
+        peak = f"{values['peak_mb']:.1f}" if "peak_mb" in values else "-"
+        print(f"  {stage:<22}{values['seconds']:>10.4f}{peak:>10}")
+    total = sum(values["seconds"] for values in results.values())
+    print(f"  {'total':<22}{total:>10.4f}")
+
+
+def compare_to_baseline(report, baseline, tolerance, min_seconds):
+    """Returns a list of stages that got slower (or heavier) than the baseline allows."""
+    regressions = []
+    for size, stages in report["results"].items():
+        baseline_stages = baseline.get("results", {}).get(size)
+        if not baseline_stages:
+            continue
+        for stage, values in stages.items():
+            reference = baseline_stages.get(stage)
+            if not reference:
+                continue
+            if values["seconds"] > max(reference["seconds"], min_seconds) * tolerance:
+                regressions.append(f"{size} keys / {stage}: {values['seconds']:.4f}s vs baseline {reference['seconds']:.4f}s")
+            if "peak_mb" in values and "peak_mb" in reference and values["peak_mb"] > max(reference["peak_mb"], 1.0) * tolerance:
+                regressions.append(f"{size} keys / {stage}: {values['peak_mb']:.1f}MB vs baseline {reference['peak_mb']:.1f}MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LocalizationUpdater stages on synthetic corpora.')
+    parser.add_argument('--Sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Numbers of keys in the generated en.json.')
+    parser.add_argument('--RenamedFraction', type=float, default=0.01, help='Fraction of keys renamed between en_old and en.')
+    parser.add_argument('--ChangedFraction', type=float, default=0.02, help='Fraction of keys whose English value changed.')
+    parser.add_argument('--RemovedFraction', type=float, default=0.01, help='Fraction of keys removed (and as many added).')
+    parser.add_argument('--MarkupFraction', type=float, default=0.2, help='Fraction of values with HTML/@UUID[...] markup.')
+    parser.add_argument('--Seed', type=int, default=0, help='Random seed of the corpus generator.')
+    parser.add_argument('--PerformRegexTranslate', action='store_true', help='Benchmark with regex re-translation of all strings.')
+    parser.add_argument('--NoMemory', action='store_true', help='Skip the (slower) traced peak memory run.')
+    parser.add_argument('--Baseline', default=DEFAULT_BASELINE, help='Baseline JSON file.')
+    parser.add_argument('--SaveBaseline', action='store_true', help='Save the results as the new baseline.')
+    parser.add_argument('--Tolerance', type=float, default=1.25, help='Allowed slowdown factor against the baseline.')
+    parser.add_argument('--MinSeconds', type=float, default=0.01, help='Stages faster than this are not compared.')
+    args = parser.parse_args()
+
+    corpus_options = {
+        "renamed_fraction": args.RenamedFraction,
+        "changed_fraction": args.ChangedFraction,
+        "removed_fraction": args.RemovedFraction,
+        "markup_fraction": args.MarkupFraction,
+        "seed": args.Seed,
+    }
+
+    report = {"corpus": corpus_options, "perform_regex_translate": args.PerformRegexTranslate, "results": {}}
+    for num_keys in args.Sizes:
+        results = benchmark_size(num_keys, corpus_options, args.PerformRegexTranslate, not args.NoMemory)
+        report["results"][str(num_keys)] = results
+        print_results(num_keys, results)
+
+    if args.SaveBaseline:
+        os.makedirs(os.path.dirname(args.Baseline), exist_ok=True)
+        with open(args.Baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"\nBaseline saved to {args.Baseline}")
+        return
+
+    if os.path.exists(args.Baseline):
+        with open(args.Baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("corpus") != corpus_options or baseline.get("perform_regex_translate") != args.PerformRegexTranslate:
+            print(f"\nBaseline {args.Baseline} was recorded with different settings, skipping comparison.")
+            return
+
+        regressions = compare_to_baseline(report, baseline, args.Tolerance, args.MinSeconds)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
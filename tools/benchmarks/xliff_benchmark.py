@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+import importlib.util
+
+from synthetic_corpus import generate_corpus
+
+TOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'xliff-tool.py')
+
+
+def load_xliff_tool():
+    """Imports tools/xliff-tool.py, whose name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location('xliff_tool', TOOL_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.writing_allowed = True
+    logging.getLogger(module.__name__).setLevel(logging.CRITICAL)
+    return module
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def read_properties(xliff_file):
+    """Reads the properties update() and export() use, a few times per unit like they do."""
+    for unit in xliff_file.translation_units():
+        unit.source, unit.source, unit.target, unit.target, unit.state
+
+
+def read_properties_with_find(xliff_file):
+    """The same reads, resolving every child with a namespaced find as the unit class used to."""
+    for unit in xliff_file.translation_units():
+        for name in ('source', 'source', 'target', 'target'):
+            xliff_file.find_xml_element(unit.xml_element, name).text
+        xliff_file.find_xml_element(unit.xml_element, 'target').get('state')
+
+
+def run_size(tool, num_keys, repeats, directory):
+    en_old, en, pl = generate_corpus(num_keys)
+    paths = {}
+    for name, data in (('en_old', en_old), ('en', en), ('pl', pl)):
+        paths[name] = os.path.join(directory, f'{name}.json')
+        with open(paths[name], 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+    xliff_path = os.path.join(directory, 'pl.xliff')
+    updated_path = os.path.join(directory, 'pl_updated.xliff')
+
+    def create():
+        with open(paths['en_old'], encoding='utf-8') as source, open(paths['pl'], encoding='utf-8') as target:
+            tool.create(xliff_path, 'en', 'pl', source, target)
+
+    def update():
+        with open(xliff_path, 'rb') as original, open(updated_path, 'wb') as copy:
+            copy.write(original.read())
+        with open(paths['en'], encoding='utf-8') as source:
+            tool.update(updated_path, source)
+
+    def export():
+        with open(os.path.join(directory, 'export.json'), 'w', encoding='utf-8') as target:
+            tool.export(updated_path, target, True, True)
+
+    create()
+    update()
+    xliff_file = tool.XliffFile.read(updated_path)
+
+    return {
+        'create': best_of(create, repeats),
+        'update': best_of(update, repeats),
+        'export': best_of(export, repeats),
+        'unit access': best_of(lambda: read_properties(xliff_file), repeats),
+        'unit access (find)': best_of(lambda: read_properties_with_find(xliff_file), repeats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure xliff-tool create/update/export and per-unit property access on synthetic files.')
+    parser.add_argument('--Sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='Numbers of keys to generate.')
+    parser.add_argument('--Repeats', type=int, default=3, help='Number of runs per step; the best one is reported.')
+    args = parser.parse_args()
+
+    tool = load_xliff_tool()
+    with tempfile.TemporaryDirectory() as directory:
+        for num_keys in args.Sizes:
+            results = run_size(tool, num_keys, args.Repeats, directory)
+            print(f"{num_keys} keys")
+            for step, milliseconds in results.items():
+                print(f"  {step:<20} {milliseconds:>10.2f} ms")
+            speedup = results['unit access (find)'] / (results['unit access'] or 1e-9)
+            print(f"  cached unit access is {speedup:.1f}x faster than find")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,10 +26,14 @@
 import argparse
 import json
 import xml.etree.ElementTree as ET
-from collections import OrderedDict
 import os.path
 import re
 import logging
+import glob
+import sys
+import time
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 
 encoding = 'utf-8' # used for all io operations
 
@@ -37,7 +41,20 @@ logging.basicConfig(style='{',
                     format='[{levelname:^7}] {message}')
 log = logging.getLogger(__name__)
 
-json_object_type = OrderedDict
+json_object_type = dict # keeps insertion order, and is what every JSON backend returns
+
+# Shared with LocalizationUpdater; uses ujson or orjson when installed
+json_backend_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'LocalizationUpdater', 'json_backend.py')
+
+def import_json_backend():
+    if not os.path.exists(json_backend_path):
+        return None # tool used on its own, plain json only
+    spec = importlib.util.spec_from_file_location('json_backend', json_backend_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+json_backend = import_json_backend()
 
 def escape_dots(s):
     return s.replace('.', '\\.')
@@ -97,8 +114,22 @@ def nested_json(flattened_data):
         _set_group_value(parent_group, _get_group_key(key_path[-1]), value)
     return r
 
+def load_json(file):
+    if json_backend is not None:
+        return json_backend.loads_json(file.read())
+    return json.load(file, object_pairs_hook=json_object_type)
+
+def dump_json(data, file, indent):
+    """Writes the same text as json.dump(data, file, ensure_ascii=False, indent=indent)."""
+    if json_backend is not None:
+        file.write(json_backend.dumps_json(data, indent))
+    else:
+        json.dump(data, file,
+                  ensure_ascii=False,
+                  indent=indent)
+
 def read_json(file, dots_are_separators):
-    raw_data = json.load(file, object_pairs_hook=json_object_type)
+    raw_data = load_json(file)
     return flattened_json(raw_data, dots_are_separators)
 
 def write_json(file, data, nest_keys=True):
@@ -106,9 +137,7 @@ def write_json(file, data, nest_keys=True):
     if nest_keys:
         data = nested_json(data)
         indent = 4
-    json.dump(data, file,
-              ensure_ascii=False,
-              indent=indent)
+    dump_json(data, file, indent)
 
 def xml_get_index(container, element):
     for index, child in enumerate(container):
@@ -123,6 +152,101 @@ def xml_insert_after(container, new_child, reference_child):
     else:
         container.append(new_child)
 
+# Prefixes ElementTree gives well-known namespaces, so the output matches ET.tostring
+well_known_namespace_prefixes = {
+    'http://www.w3.org/XML/1998/namespace': 'xml',
+    'http://www.w3.org/1999/xhtml': 'html',
+    'http://www.w3.org/1999/02/22-rdf-syntax-ns#': 'rdf',
+    'http://schemas.xmlsoap.org/wsdl/': 'wsdl',
+    'http://www.w3.org/2001/XMLSchema': 'xs',
+    'http://www.w3.org/2001/XMLSchema-instance': 'xsi',
+    'http://purl.org/dc/elements/1.1/': 'dc',
+}
+
+def escape_xml_text(text):
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+def escape_xml_attribute(text):
+    text = escape_xml_text(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    # Line breaks and tabs would be normalized to spaces when read back
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+def xml_qualified_names(root, default_namespace):
+    """
+    Returns ({'{uri}name': 'prefix:name'}, {uri: prefix}) for the tags and
+    attributes in the tree, with 'default_namespace' as the unprefixed one and
+    other namespaces prefixed the way ElementTree does it.
+    """
+    qnames = {}
+    namespaces = {default_namespace: ''}
+
+    def add_qname(qname):
+        if qname[:1] != '{':
+            qnames[qname] = qname
+            return
+        uri, name = qname[1:].rsplit('}', 1)
+        prefix = namespaces.get(uri)
+        if prefix is None:
+            prefix = well_known_namespace_prefixes.get(uri)
+            if prefix is None:
+                prefix = 'ns{}'.format(len(namespaces))
+            if prefix != 'xml': # predeclared, never written
+                namespaces[uri] = prefix
+        qnames[qname] = '{}:{}'.format(prefix, name) if prefix else name
+
+    for element in root.iter():
+        if isinstance(element.tag, str) and element.tag not in qnames:
+            add_qname(element.tag)
+        for key in element.keys():
+            if key not in qnames:
+                add_qname(key)
+    return qnames, namespaces
+
+def write_xml_element(write, element, qnames, namespaces=None):
+    """
+    Writes an element and its subtree piece by piece, like ElementTree's own
+    serializer, but with empty elements closed as '<tag/>' instead of '<tag />'.
+    """
+    tag = element.tag
+    text = element.text
+    if tag is ET.Comment:
+        write('<!--{}-->'.format(text.replace(' />', '/>')))
+    elif tag is ET.ProcessingInstruction:
+        write('<?{}?>'.format(text.replace(' />', '/>')))
+    else:
+        tag = qnames[tag]
+        write('<' + tag)
+        if namespaces:
+            for (uri, prefix) in sorted(namespaces.items(), key=lambda item: item[1]):
+                write(' xmlns{}="{}"'.format(':' + prefix if prefix else '', escape_xml_attribute(uri)))
+        for (key, value) in element.items():
+            write(' {}="{}"'.format(qnames[key], escape_xml_attribute(value)))
+        if text or len(element):
+            write('>')
+            if text:
+                write(escape_xml_text(text))
+            for child in element:
+                write_xml_element(write, child, qnames)
+            write('</' + tag + '>')
+        else:
+            write('/>')
+    if element.tail:
+        write(escape_xml_text(element.tail))
+
 class XliffFile:
     def read(file_path):
         tree = ET.parse(file_path, ET.XMLParser(encoding=encoding))
@@ -147,8 +271,15 @@ class XliffFile:
             raise ValueError('No namespace found')
         self.namespace = namespace
         self.namespaces = {'': namespace}
+        self.unit_child_tags = (self.tag('source'), self.tag('target'), self.tag('note'))
         ET.register_namespace('', namespace)
         self.body = self.find_xml_element(self.tree.getroot(), './file/body')
+        # id -> <trans-unit> elements with that id; lookups return the first one, like the XPath search did
+        self.units_by_id = {}
+        for xml_unit in self.find_all_xml_elements(self.body, './trans-unit'):
+            self.units_by_id.setdefault(xml_unit.get('id'), []).append(xml_unit)
+        # reference element (None = end of body) -> units to insert after it, see begin_insertions()
+        self.pending_insertions = None
 
     def tag(self, name):
         return '{{{}}}{}'.format(self.namespace, name)
@@ -161,10 +292,10 @@ class XliffFile:
 
     def write(self):
         ET.indent(self.tree)
-        string = ET.tostring(self.tree.getroot(), encoding=encoding).decode(encoding)
-        string = re.sub(r' />', '/>', string)
+        root = self.tree.getroot()
+        qnames, namespaces = xml_qualified_names(root, self.namespace)
         with open(self.file_path, 'wt', encoding=encoding) as file:
-            file.write(string)
+            write_xml_element(file.write, root, qnames, namespaces)
         #self.tree.write(self.file_path, encoding=encoding)
 
     def get_source_language(self):
@@ -187,26 +318,100 @@ class XliffFile:
         xml_unit = ET.Element(self.tag('trans-unit'), id=id)
         ET.SubElement(xml_unit, self.tag('source')).text = source_text
         ET.SubElement(xml_unit, self.tag('target'))
-        xml_insert_after(self.body, xml_unit, insert_after.xml_element if insert_after else None)
+        reference = insert_after.xml_element if insert_after else None
+        if self.pending_insertions is not None:
+            self._queue_insertion(xml_unit, reference)
+        else:
+            xml_insert_after(self.body, xml_unit, reference)
+        self.units_by_id.setdefault(id, []).append(xml_unit)
         unit = XliffTranslationUnit(self, xml_unit)
         unit.state = 'new'
         return unit
 
+    def begin_insertions(self):
+        """
+        Defers body insertions of new units until flush_insertions(), which
+        places all of them in one pass instead of one index scan per unit.
+        """
+        self.pending_insertions = {}
+
+    def _queue_insertion(self, xml_unit, reference):
+        pending = self.pending_insertions.setdefault(reference, [])
+        if reference is None:
+            pending.append(xml_unit)
+        else:
+            # Like repeated xml_insert_after: the latest insertion lands right after the reference
+            pending.insert(0, xml_unit)
+
+    def flush_insertions(self):
+        pending, self.pending_insertions = self.pending_insertions, None
+        if not pending:
+            return
+        children = []
+        stack = list(reversed(list(self.body) + pending.get(None, [])))
+        while stack:
+            element = stack.pop()
+            children.append(element)
+            stack.extend(reversed(pending.get(element, [])))
+        self.body[:] = children
+
     def remove_translation_unit(self, unit):
         self.body.remove(unit.xml_element)
+        xml_units = self.units_by_id.get(unit.id, [])
+        if unit.xml_element in xml_units:
+            xml_units.remove(unit.xml_element)
+            if not xml_units:
+                del self.units_by_id[unit.id]
+
+    def rename_translation_unit(self, unit, new_id):
+        xml_units = self.units_by_id.get(unit.id, [])
+        if unit.xml_element in xml_units:
+            xml_units.remove(unit.xml_element)
+            if not xml_units:
+                del self.units_by_id[unit.id]
+        unit.xml_element.set('id', new_id)
+        self.units_by_id.setdefault(new_id, []).append(unit.xml_element)
+
+    def order_translation_units(self, ids):
+        """
+        Reorders the body so the first unit of each given id comes in the given
+        order. Any other children keep their relative order after them.
+        """
+        ordered = []
+        for unit_id in ids:
+            xml_units = self.units_by_id.get(unit_id)
+            if xml_units:
+                ordered.append(xml_units[0])
+        placed = set(map(id, ordered))
+        self.body[:] = ordered + [child for child in self.body if id(child) not in placed]
 
     def find_translation_unit(self, id):
-        escaped_id = id.replace('"', '&quot;')
-        xml_unit = self.find_xml_element(self.body, f'./trans-unit[@id="{escaped_id}"]')
-        if xml_unit:
-            return XliffTranslationUnit(self, xml_unit)
+        xml_units = self.units_by_id.get(id)
+        if xml_units:
+            return XliffTranslationUnit(self, xml_units[0])
         else:
             return None
 
 class XliffTranslationUnit:
+    __slots__ = ('xliff_file', 'xml_element', 'xml_source', 'xml_target', 'xml_notes')
+
     def __init__(self, xliff_file, xml_element):
         self.xliff_file = xliff_file
         self.xml_element = xml_element
+        # Children are resolved once here instead of with a namespaced find on every property access
+        self.xml_source = None
+        self.xml_target = None
+        self.xml_notes = []
+        source_tag, target_tag, note_tag = xliff_file.unit_child_tags
+        for child in xml_element:
+            if child.tag == source_tag:
+                if self.xml_source is None:
+                    self.xml_source = child
+            elif child.tag == target_tag:
+                if self.xml_target is None:
+                    self.xml_target = child
+            elif child.tag == note_tag:
+                self.xml_notes.append(child)
 
     def get_id(self):
         return self.xml_element.get('id')
@@ -225,7 +430,7 @@ class XliffTranslationUnit:
             self.xml_element.attrib.pop('approved', None)
 
     def get_sub_element(self, name):
-        element = self.xliff_file.find_xml_element(self.xml_element, name)
+        element = self.xml_source if name == 'source' else self.xml_target if name == 'target' else None
         if element is None:
             raise ValueError(f'Translation unit has no {name} entry')
         return element
@@ -269,21 +474,28 @@ class XliffTranslationUnit:
     state = property(get_state, set_state)
 
     def notes(self):
-        for xml_note in self.xliff_file.find_all_xml_elements(self.xml_element, 'note'):
+        for xml_note in list(self.xml_notes):
             yield XliffNote(self, xml_note)
 
     def create_note(self, text, author=None, insert_after=None):
         xml_note = ET.Element(self.xliff_file.tag('note'))
         xml_note.text = text
         xml_insert_after(self.xml_element, xml_note, insert_after)
+        if insert_after is None:
+            self.xml_notes.append(xml_note)
+        else:
+            self.xml_notes = [child for child in self.xml_element if child.tag == xml_note.tag]
         note = XliffNote(self, xml_note)
         note.author = author
         return note
 
     def remove_note(self, note):
         self.xml_element.remove(note.xml_element)
+        self.xml_notes.remove(note.xml_element)
 
 class XliffNote:
+    __slots__ = ('unit', 'xml_element')
+
     def __init__(self, unit, xml_element):
         self.unit = unit
         self.xml_element = xml_element
@@ -349,6 +561,7 @@ def update(xliff_file_path, source_json_file, remove_nonexisting=True, dots_are_
             if remove_nonexisting:
                 xliff_file.remove_translation_unit(unit)
     previous_unit = None
+    xliff_file.begin_insertions()
     for (id, source_text) in source_json.items():
         unit = xliff_file.find_translation_unit(id)
         if unit is not None:
@@ -373,13 +586,83 @@ def update(xliff_file_path, source_json_file, remove_nonexisting=True, dots_are_
                      source_text)
             unit = xliff_file.create_translation_unit(id, source_text, previous_unit)
         previous_unit = unit
+    xliff_file.flush_insertions()
     if writing_allowed:
         xliff_file.write()
 
+class StreamedTranslationUnit:
+    """Read-only snapshot of a trans-unit, detached from any XML tree."""
+    def __init__(self, id, source, target, approved):
+        self.id = id
+        self.source = source
+        self.target = target
+        self.approved = approved
+
+    def is_approved(self):
+        return self.approved
+
+def stream_translation_units(xliff_file_path):
+    """
+    Yields the trans-units of an XLIFF file without building the whole tree.
+    Each unit is removed from the partial tree once it has been read, so
+    memory use does not grow with the size of the file.
+    """
+    namespace = None
+    body = None
+    path = []
+    for event, element in ET.iterparse(xliff_file_path, events=('start', 'end'), parser=ET.XMLParser(encoding=encoding)):
+        if event == 'start':
+            if namespace is None:
+                namespace = element.tag.removeprefix('{').removesuffix('}xliff')
+                if namespace == element.tag:
+                    raise ValueError('No namespace found')
+                tags = ['{{{}}}{}'.format(namespace, name) for name in ('xliff', 'file', 'body', 'trans-unit', 'source', 'target')]
+                body_path = tags[:3]
+                unit_tag, source_tag, target_tag = tags[3:]
+            path.append(element)
+            if [e.tag for e in path] == body_path:
+                body = element
+            continue
+
+        path.pop()
+        if element.tag == unit_tag and path and path[-1] is body:
+            source = element.find(source_tag)
+            target = element.find(target_tag)
+            if source is None:
+                raise ValueError('Translation unit has no source entry')
+            if target is None:
+                raise ValueError('Translation unit has no target entry')
+            yield StreamedTranslationUnit(element.get('id'), source.text, target.text, element.get('approved') == 'yes')
+            element.clear()
+            body.remove(element)
+
+def write_flat_json_stream(file, items):
+    """Writes (key, value) pairs in the same layout as json.dump(..., indent=0), one item at a time."""
+    first = True
+    for (key, value) in items:
+        file.write('{\n' if first else ',\n')
+        file.write(json.dumps(key, ensure_ascii=False))
+        file.write(': ')
+        file.write(json.dumps(value, ensure_ascii=False))
+        first = False
+    file.write('{}' if first else '\n}')
+
 def export(xliff_file_path, target_json_file, write_nested_json, default_to_source):
-    xliff_file = XliffFile.read(xliff_file_path)
+    # Only the flat strings are kept, not the XML tree
+    target_json = exported_items(xliff_file_path, default_to_source)
+    if writing_allowed:
+        if write_nested_json:
+            write_json(target_json_file, target_json, write_nested_json)
+        else:
+            write_flat_json_stream(target_json_file, target_json.items())
+
+def exported_items(xliff_file_path, default_to_source):
+    """
+    Returns {id: text} for the units to export. A duplicated id keeps the
+    position of its first unit and the text of its last one.
+    """
     target_json = json_object_type()
-    for unit in xliff_file.translation_units():
+    for unit in stream_translation_units(xliff_file_path):
         text = unit.target
         if not text:
             log.error('%s: no translation, using source text\n'
@@ -399,9 +682,107 @@ def export(xliff_file_path, target_json_file, write_nested_json, default_to_sour
                         'target',
                         unit.target)
         if text:
+            if unit.id in target_json:
+                log.warning('%s: duplicate translation unit, using the last one', unit.id)
             target_json[unit.id] = text
-    if writing_allowed:
-        write_json(target_json_file, target_json, write_nested_json)
+    return target_json
+
+class LevelCountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.counts = {'WARNING': 0, 'ERROR': 0}
+
+    def emit(self, record):
+        level = 'ERROR' if record.levelno >= logging.ERROR else 'WARNING'
+        self.counts[level] += 1
+
+def batch_pairs(pairs_spec, command, json_template, xliff_template):
+    """
+    Returns (xliff, json, target json or None) triples, either from a JSON manifest
+    (a list of {"xliff": ..., "json": ..., "target-json": ...} objects) or from a glob.
+    The glob matches XLIFF files whose JSON paths are derived with json_template,
+    except for create, where it matches source JSON files and xliff_template is used.
+    """
+    if pairs_spec.endswith('.json') and os.path.isfile(pairs_spec):
+        with open(pairs_spec, encoding=encoding) as file:
+            manifest = json.load(file)
+        return [(entry['xliff'], entry['json'], entry.get('target-json')) for entry in manifest]
+    pairs = []
+    for path in sorted(glob.glob(pairs_spec, recursive=True)):
+        directory, file_name = os.path.split(path)
+        stem = os.path.splitext(file_name)[0]
+        if command == 'create':
+            pairs.append((xliff_template.format(dir=directory or '.', stem=stem), path, None))
+        else:
+            pairs.append((path, json_template.format(dir=directory or '.', stem=stem), None))
+    return pairs
+
+def init_batch_worker(log_level, allow_writing):
+    global writing_allowed
+    log.setLevel(log_level)
+    writing_allowed = allow_writing
+
+def run_batch_job(job):
+    (command, xliff_file_path, json_file_path, target_json_file_path, options) = job
+    handler = LevelCountingHandler()
+    log.addHandler(handler)
+    start = time.perf_counter()
+    error = None
+    try:
+        if command == 'create':
+            with open(json_file_path, encoding=encoding) as source_json_file:
+                target_json_file = open(target_json_file_path, encoding=encoding) if target_json_file_path else None
+                try:
+                    create(xliff_file_path, options['source_language'], options['target_language'], source_json_file, target_json_file, not options['tree'])
+                finally:
+                    if target_json_file:
+                        target_json_file.close()
+        elif command == 'update-from':
+            with open(json_file_path, encoding=encoding) as source_json_file:
+                update(xliff_file_path, source_json_file, not options['keep_nonexisting'], not options['tree'])
+        elif command == 'export-to':
+            if writing_allowed:
+                with open(json_file_path, 'w', encoding=encoding) as target_json_file:
+                    export(xliff_file_path, target_json_file, options['tree'], not options['ignore_missing'])
+            else:
+                export(xliff_file_path, None, options['tree'], not options['ignore_missing'])
+    except Exception as e:
+        log.error('%s: %s', xliff_file_path, e)
+        error = str(e)
+    finally:
+        log.removeHandler(handler)
+    return {
+        'xliff': xliff_file_path,
+        'json': json_file_path,
+        'status': 'failed' if error else 'ok',
+        'warnings': handler.counts['WARNING'],
+        'errors': handler.counts['ERROR'],
+        'seconds': time.perf_counter() - start,
+    }
+
+def batch(pairs_spec, command, json_template, xliff_template, jobs, options):
+    pairs = batch_pairs(pairs_spec, command, json_template, xliff_template)
+    work = [(command, xliff_file_path, json_file_path, target_json_file_path, options)
+            for (xliff_file_path, json_file_path, target_json_file_path) in pairs]
+    if jobs == 1 or len(work) < 2:
+        results = [run_batch_job(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None,
+                                 initializer=init_batch_worker,
+                                 initargs=(log.level, writing_allowed)) as executor:
+            results = list(executor.map(run_batch_job, work))
+    print_batch_summary(command, results)
+    return all(result['status'] == 'ok' for result in results)
+
+def print_batch_summary(command, results):
+    print(f'{command}: {len(results)} file(s)')
+    print(f'{"status":<7} {"warnings":>8} {"errors":>6} {"seconds":>8}  xliff -> json')
+    for result in results:
+        print(f'{result["status"]:<7} {result["warnings"]:>8} {result["errors"]:>6} {result["seconds"]:>8.2f}  {result["xliff"]} -> {result["json"]}')
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    print(f'{len(results) - failed} ok, {failed} failed, '
+          f'{sum(result["warnings"] for result in results)} warning(s), '
+          f'{sum(result["errors"] for result in results)} error(s)')
 
 class HelpAction(argparse._HelpAction):
     # Code from https://stackoverflow.com/a/24122778
@@ -428,7 +809,7 @@ def parse_args():
                         action='store_true',
                         help="Don't write any files")
     parser.add_argument('xliff',
-                        help='The XLIFF file')
+                        help='The XLIFF file (for batch: a JSON manifest of file pairs or a glob of XLIFF files)')
 
     subparsers = parser.add_subparsers(required=True,
                                        metavar='command',
@@ -475,7 +856,39 @@ def parse_args():
                                action='store_true',
                                help="Don't export keys with missing translations (Might become default in the future)")
 
-    return parser.parse_args()
+    batch_parser = subparsers.add_parser('batch',
+                                         help='Run create, update-from or export-to over many XLIFF/JSON pairs')
+    batch_parser.add_argument('batch_command',
+                              choices=['create', 'update-from', 'export-to'],
+                              help='Command to run for every pair')
+    batch_parser.add_argument('--json-template',
+                              default='{dir}/{stem}.json',
+                              help='JSON path for each globbed XLIFF file ({dir} and {stem} are replaced)')
+    batch_parser.add_argument('--xliff-template',
+                              default='{dir}/{stem}.xliff',
+                              help='create: XLIFF path for each globbed source JSON file ({dir} and {stem} are replaced)')
+    batch_parser.add_argument('-j', '--jobs',
+                              type=int,
+                              default=1,
+                              help='Number of worker processes (0 = one per CPU core)')
+    batch_parser.add_argument('-s', '--source-language',
+                              default='en-US')
+    batch_parser.add_argument('--target-language',
+                              help='Target language for create')
+    batch_parser.add_argument('-k', '--keep-nonexisting',
+                              action='store_true',
+                              help="update-from: don't remove XLIFF entries missing from the source")
+    batch_parser.add_argument('-t', '--tree',
+                              action='store_true',
+                              help='Same as --tree of the chosen command')
+    batch_parser.add_argument('-i', '--ignore-missing',
+                              action='store_true',
+                              help="export-to: don't export keys with missing translations")
+
+    args = parser.parse_args()
+    if args.command == 'batch' and args.batch_command == 'create' and not args.target_language:
+        parser.error('batch create requires --target-language')
+    return args
 
 if __name__ == '__main__':
     args = parse_args()
@@ -488,3 +901,13 @@ if __name__ == '__main__':
         update(args.xliff, args.json, not args.keep_nonexisting, not args.tree)
     elif args.command == 'export-to':
         export(args.xliff, args.json, args.tree, not args.ignore_missing)
+    elif args.command == 'batch':
+        options = {
+            'source_language': args.source_language,
+            'target_language': args.target_language,
+            'keep_nonexisting': args.keep_nonexisting,
+            'tree': args.tree,
+            'ignore_missing': args.ignore_missing,
+        }
+        if not batch(args.xliff, args.batch_command, args.json_template, args.xliff_template, args.jobs, options):
+            sys.exit(1)